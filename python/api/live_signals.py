@@ -0,0 +1,207 @@
+import asyncio
+import json
+import os
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Set, Tuple
+
+import pandas as pd
+
+from ..utils import instrumentation
+
+# Outgoing messages buffered per client before the oldest are dropped
+CLIENT_QUEUE_SIZE = 256
+
+
+class BarFeed(ABC):
+    """Source of live bars; implementations yield (symbol, bar) in time order"""
+
+    @abstractmethod
+    def bars(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Async iterator of (symbol, bar) pairs, usually an async generator method"""
+        pass
+
+
+class FileReplayFeed(BarFeed):
+    def __init__(self, data_dir: str, interval: float = 1.0, loop: bool = False):
+        """
+        Replay per-symbol CSV files (date, open, high, low, close, volume) as a live feed
+
+        Args:
+            data_dir (str): Directory containing <symbol>.csv files
+            interval (float): Seconds between replayed timestamps
+            loop (bool): Restart from the beginning when the files are exhausted
+        """
+        self.data_dir = data_dir
+        self.interval = interval
+        self.loop = loop
+
+    def _load(self) -> pd.DataFrame:
+        frames = []
+        for name in sorted(os.listdir(self.data_dir)):
+            if name.endswith('.csv'):
+                df = pd.read_csv(os.path.join(self.data_dir, name), parse_dates=['date'])
+                df['symbol'] = name[:-4]
+                frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=['date', 'symbol'])
+        return pd.concat(frames).sort_values(['date', 'symbol'], kind='stable')
+
+    async def bars(self) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        while True:
+            bars = self._load()
+            for _, group in bars.groupby('date', sort=True):
+                for record in group.to_dict('records'):
+                    yield record.pop('symbol'), record
+                await asyncio.sleep(self.interval)
+            if not self.loop:
+                return
+
+
+class SignalComputation:
+    def __init__(self, key: tuple, strategy):
+        """One shared live computation per distinct (symbol, strategy, params)"""
+        self.key = key
+        self.state = strategy.signal_state()
+        self.signal: Optional[int] = None
+        self.last_bar: Optional[Dict[str, Any]] = None
+        self.subscribers: Set[asyncio.Queue] = set()
+
+    def message(self) -> str:
+        symbol, strategy_name, params = self.key
+        bar = self.last_bar or {}
+        return json.dumps({
+            'type': 'signal',
+            'symbol': symbol,
+            'strategy': strategy_name,
+            'params': json.loads(params),
+            'signal': self.signal,
+            'date': str(bar.get('date')) if bar else None,
+            'close': float(bar['close']) if bar else None
+        })
+
+
+class SignalHub:
+    def __init__(self, strategy_factories: Dict[str, Callable[[Dict[str, Any]], Any]],
+                 history_size: int = 500):
+        """
+        Fan-out of live strategy signals to WebSocket subscribers
+
+        Identical subscriptions share one SignalComputation; each bar updates
+        every computation for its symbol once, and a message is serialized once
+        and queued to subscribers only when the signal changes.
+
+        Args:
+            strategy_factories: Strategy name -> callable building it from params
+            history_size (int): Recent bars kept per symbol to warm up new computations
+        """
+        self.strategy_factories = strategy_factories
+        self.computations: Dict[tuple, SignalComputation] = {}
+        self.by_symbol: Dict[str, Dict[tuple, SignalComputation]] = defaultdict(dict)
+        self.history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=history_size))
+        self._defaults: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def make_key(symbol: str, strategy_name: str, params: Dict[str, Any]) -> tuple:
+        return (symbol, strategy_name, json.dumps(params or {}, sort_keys=True, default=str))
+
+    def key(self, symbol: str, strategy_name: str, params: Dict[str, Any]) -> tuple:
+        """
+        Subscription key with params merged over the strategy's defaults, so {}
+        and the explicit defaults share one computation
+
+        Raises ValueError for an unknown strategy.
+        """
+        if strategy_name not in self.strategy_factories:
+            raise ValueError(f"Invalid strategy name: {strategy_name}")
+        if strategy_name not in self._defaults:
+            strategy = self.strategy_factories[strategy_name](None)
+            self._defaults[strategy_name] = dict(strategy.parameters)
+        params = {**self._defaults[strategy_name], **(params or {})}
+        return self.make_key(symbol, strategy_name, params)
+
+    def subscribe(self, queue: asyncio.Queue, symbol: str, strategy_name: str,
+                  params: Dict[str, Any]) -> tuple:
+        """
+        Attach a client queue, creating and warming up the computation if needed
+
+        Params are merged over the strategy's defaults (see key). Raises
+        ValueError for an unknown strategy or params the strategy cannot be
+        built or run with.
+        """
+        key = self.key(symbol, strategy_name, params)
+        computation = self.computations.get(key)
+        if computation is None:
+            try:
+                strategy = self.strategy_factories[strategy_name](json.loads(key[2]))
+                computation = SignalComputation(key, strategy)
+                for bar in self.history[symbol]:
+                    computation.signal = computation.state.update(bar)
+                    computation.last_bar = bar
+            except Exception as e:
+                raise ValueError(f"Invalid params for {strategy_name}: {e!r}") from e
+            self.computations[key] = computation
+            self.by_symbol[symbol][key] = computation
+            instrumentation.increment('live_computations_created')
+        computation.subscribers.add(queue)
+        if computation.signal is not None:
+            self.send(queue, computation.message())
+        return key
+
+    def unsubscribe(self, queue: asyncio.Queue, key: tuple):
+        """Detach a client queue; computations without subscribers are dropped"""
+        computation = self.computations.get(key)
+        if computation is None:
+            return
+        computation.subscribers.discard(queue)
+        if not computation.subscribers:
+            del self.computations[key]
+            del self.by_symbol[key[0]][key]
+
+    def on_bar(self, symbol: str, bar: Dict[str, Any]):
+        """Advance every computation for the symbol and push signal changes"""
+        self.history[symbol].append(bar)
+        for computation in list(self.by_symbol.get(symbol, {}).values()):
+            try:
+                signal = computation.state.update(bar)
+            except Exception as e:
+                # One failing computation must not stop the feed for every other subscriber
+                self._fail(computation, e)
+                continue
+            computation.last_bar = bar
+            if signal != computation.signal:
+                computation.signal = signal
+                message = computation.message()
+                for queue in computation.subscribers:
+                    self.send(queue, message)
+                instrumentation.increment('live_signal_changes')
+
+    def _fail(self, computation: SignalComputation, error: Exception):
+        """Drop a computation whose update raised and tell its subscribers"""
+        symbol, strategy_name, params = computation.key
+        message = json.dumps({
+            'type': 'error',
+            'symbol': symbol,
+            'strategy': strategy_name,
+            'params': json.loads(params),
+            'detail': f"Signal computation failed: {error!r}"
+        })
+        for queue in computation.subscribers:
+            self.send(queue, message)
+        self.computations.pop(computation.key, None)
+        self.by_symbol[symbol].pop(computation.key, None)
+        instrumentation.increment('live_computation_errors')
+
+    @staticmethod
+    def send(queue: asyncio.Queue, message: str):
+        """Queue a message for a client without blocking"""
+        if queue.full():
+            # Slow client: drop its oldest message rather than block the feed
+            queue.get_nowait()
+        queue.put_nowait(message)
+
+    async def run(self, feed: BarFeed):
+        """Consume a feed until it ends"""
+        async for symbol, bar in feed.bars():
+            with instrumentation.timer('live_bar'):
+                self.on_bar(symbol, bar)
@@ -1,13 +1,70 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import BackgroundTasks, FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+import asyncio
+import contextlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 import pandas as pd
 import yfinance as yf
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from ..strategies.moving_average_strategy import MovingAverageCrossoverStrategy
 from ..backtest.backtest_engine import BacktestEngine
+from ..backtest.robustness import analyze_backtest
+from ..features.resampler import parse_timeframe
+from ..screeners.results_store import ScreenerResultsStore
+from ..utils import instrumentation
+from .live_signals import SignalHub, FileReplayFeed, CLIENT_QUEUE_SIZE
 
 app = FastAPI()
 
+# "profile": true in /backtest requests is rejected unless PROFILE_ENABLED=1
+PROFILE_ENABLED = os.environ.get('PROFILE_ENABLED', '0').lower() in ('1', 'true', 'yes')
+
+# Directory for sampling profiler output of requests with "profile": true
+PROFILE_DIR = os.environ.get('PROFILE_DIR', tempfile.gettempdir())
+
+# Directory of <symbol>.csv bars replayed as the live feed for /ws/signals
+LIVE_FEED_DIR = os.environ.get('LIVE_FEED_DIR')
+
+STRATEGIES = {
+    "MovingAverageCrossover": MovingAverageCrossoverStrategy
+}
+
+signal_hub = SignalHub(STRATEGIES)
+
+# History of screener runs served by the /screeners endpoints
+SCREENER_RESULTS_DB = os.environ.get('SCREENER_RESULTS_DB', 'screener_results.sqlite')
+
+# JSON database parameters for runs triggered through POST /screeners/run
+SCREENER_DB_PARAMS = os.environ.get('SCREENER_DB_PARAMS')
+
+# Most recently used screener query results kept in memory
+SCREENER_CACHE_SIZE = int(os.environ.get('SCREENER_CACHE_SIZE', '1024'))
+
+_results_store: Optional[ScreenerResultsStore] = None
+_screener_cache: 'OrderedDict[tuple, Any]' = OrderedDict()
+_screener_cache_generation: Optional[int] = None
+_screener_cache_lock = threading.Lock()
+_screener_run_lock = threading.Lock()
+
+# Upper bound on resampled paths per /backtest request
+MAX_ROBUSTNESS_PATHS = 100_000
+
+class RobustnessOptions(BaseModel):
+    n_paths: int = Field(10000, ge=1, le=MAX_ROBUSTNESS_PATHS)
+    block_size: int = Field(20, ge=1)
+    slippage_bps: float = Field(5.0, ge=0)
+    commission_range: Tuple[float, float] = (0.5, 2.0)
+    confidence: float = Field(0.95, gt=0, lt=1)
+    n_jobs: int = Field(1, ge=-1, le=os.cpu_count() or 1)  # -1 for all cores
+    seed: Optional[int] = None
+
 class BacktestRequest(BaseModel):
     symbol: str
     strategy_name: str
@@ -16,45 +73,257 @@ class BacktestRequest(BaseModel):
     end_date: str
     initial_capital: float = 100000.0
     commission: float = 0.0
+    interval: str = "1d"  # Bar interval fetched from Yahoo Finance
+    timeframe: Optional[str] = None  # Resample fetched bars to this timeframe, e.g. "1w", "1mo"
+    profile: bool = False  # Write a folded-stack profile of this run to PROFILE_DIR (needs PROFILE_ENABLED)
+    robustness: Optional[RobustnessOptions] = None  # Add Monte Carlo / bootstrap analysis
+
+@app.middleware("http")
+async def timing_middleware(request: Request, call_next):
+    """Record request duration and expose the per-stage breakdown as a Server-Timing header"""
+    if not instrumentation.is_enabled():
+        return await call_next(request)
+    
+    with instrumentation.request_timings() as timings:
+        start = time.perf_counter()
+        response = await call_next(request)
+        # Label by route template, not the raw path, so label values stay bounded
+        route = getattr(request.scope.get('route'), 'path', 'unmatched')
+        instrumentation.observe('http_request', time.perf_counter() - start, (('path', route),))
+    response.headers['Server-Timing'] = ', '.join(
+        f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()
+    )
+    return response
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics (empty unless METRICS_ENABLED=1)"""
+    return PlainTextResponse(instrumentation.render_prometheus(),
+                             media_type="text/plain; version=0.0.4")
 
 @app.post("/backtest")
-async def run_backtest(request: BacktestRequest):
+def run_backtest(request: BacktestRequest):
+    # Plain def: FastAPI runs the download, simulation and robustness analysis in its threadpool
     try:
-        # Fetch data from Yahoo Finance
-        data = yf.download(
-            request.symbol,
-            start=request.start_date,
-            end=request.end_date,
-            interval="1d"
-        )
-        
-        if data.empty:
-            raise HTTPException(status_code=404, detail="No data found for the symbol")
+        profile_file = None
+        profiler = contextlib.nullcontext()
+        if request.profile:
+            if not PROFILE_ENABLED:
+                raise HTTPException(status_code=403, detail="Profiling is disabled (set PROFILE_ENABLED=1)")
+            # The symbol is client input: keep it to one safe path component
+            symbol = re.sub(r'[^A-Za-z0-9.^=-]', '_', request.symbol)[:32]
+            profile_file = os.path.join(
+                PROFILE_DIR,
+                f"backtest_{symbol}_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S_%f')}.folded"
+            )
+            profiler = instrumentation.SamplingProfiler(profile_file)
         
-        # Initialize strategy
-        if request.strategy_name == "MovingAverageCrossover":
-            strategy = MovingAverageCrossoverStrategy(request.strategy_params)
-        else:
-            raise HTTPException(status_code=400, detail="Invalid strategy name")
-        
-        # Run backtest
-        engine = BacktestEngine(
-            initial_capital=request.initial_capital,
-            commission=request.commission
-        )
-        results = engine.run(data, strategy)
+        with profiler:
+            results = _run_backtest(request)
         
-        # Convert numpy types to Python native types for JSON serialization
-        results['total_return'] = float(results['total_return'])
-        results['sharpe_ratio'] = float(results['sharpe_ratio'])
-        results['max_drawdown'] = float(results['max_drawdown'])
-        results['equity_curve'] = [float(x) for x in results['equity_curve']]
+        if instrumentation.is_enabled():
+            results['timings'] = instrumentation.current_timings()
+        if profile_file:
+            results['profile_file'] = profile_file
         
         return results
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _run_backtest(request: BacktestRequest) -> Dict[str, Any]:
+    if request.timeframe is not None:
+        try:
+            parse_timeframe(request.timeframe)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    # Fetch data from Yahoo Finance
+    with instrumentation.timer('yf_download'):
+        data = yf.download(
+            request.symbol,
+            start=request.start_date,
+            end=request.end_date,
+            interval=request.interval
+        )
+    
+    if data.empty:
+        raise HTTPException(status_code=404, detail="No data found for the symbol")
+    data.attrs['symbol'] = request.symbol
+    data.attrs['interval'] = request.interval  # Annualizes the simulated bars
+    
+    # Initialize strategy
+    if request.strategy_name in STRATEGIES:
+        # No shared feature store: results must only depend on the requested window
+        strategy = STRATEGIES[request.strategy_name](request.strategy_params)
+    else:
+        raise HTTPException(status_code=400, detail="Invalid strategy name")
+    
+    # Run backtest
+    # No shared resampler: cached periods would hold bars from other requests' windows
+    engine = BacktestEngine(
+        initial_capital=request.initial_capital,
+        commission=request.commission
+    )
+    results = engine.run(data, strategy, timeframe=request.timeframe)
+    instrumentation.increment('backtests', strategy=request.strategy_name)
+    
+    if request.robustness is not None:
+        with instrumentation.timer('robustness'):
+            results['robustness'] = analyze_backtest(
+                results,
+                initial_capital=request.initial_capital,
+                commission=request.commission,
+                periods_per_year=results['periods_per_year'],
+                **request.robustness.dict()
+            )
+    
+    # Convert numpy types to Python native types for JSON serialization
+    results['total_return'] = float(results['total_return'])
+    results['sharpe_ratio'] = float(results['sharpe_ratio'])
+    results['max_drawdown'] = float(results['max_drawdown'])
+    results['equity_curve'] = [float(x) for x in results['equity_curve']]
+    
+    return results
+
+def get_results_store() -> ScreenerResultsStore:
+    global _results_store
+    if _results_store is None:
+        _results_store = ScreenerResultsStore(SCREENER_RESULTS_DB)
+    return _results_store
+
+def _cached_screener_query(key: tuple, query):
+    """
+    Serve a results query from memory until a new screener run completes,
+    which may happen in this process or in a separately scheduled job; the
+    SCREENER_CACHE_SIZE most recently used results are kept
+    """
+    global _screener_cache_generation
+    generation = get_results_store().generation()
+    with _screener_cache_lock:
+        if generation != _screener_cache_generation:
+            _screener_cache.clear()
+            _screener_cache_generation = generation
+        if key in _screener_cache:
+            _screener_cache.move_to_end(key)
+            return _screener_cache[key]
+    result = query()
+    with _screener_cache_lock:
+        if generation == _screener_cache_generation:
+            _screener_cache[key] = result
+            while len(_screener_cache) > SCREENER_CACHE_SIZE:
+                _screener_cache.popitem(last=False)
+    return result
+
+@app.get("/screeners/runs")
+def screener_runs(limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)):
+    """Completed screener runs, newest first"""
+    store = get_results_store()
+    return _cached_screener_query(('runs', limit, offset), lambda: store.runs(limit, offset))
+
+@app.get("/screeners/{screener}/latest")
+def latest_screener_matches(screener: str, limit: int = Query(50, ge=1, le=500),
+                            offset: int = Query(0, ge=0)):
+    """Matches of a screener in its most recent run"""
+    store = get_results_store()
+    results = _cached_screener_query(
+        ('latest', screener, limit, offset),
+        lambda: store.latest_matches(screener, limit, offset)
+    )
+    if results['run_id'] is None:
+        raise HTTPException(status_code=404, detail=f"No results for screener: {screener}")
+    return results
+
+@app.get("/screeners/symbols/{symbol}/history")
+def symbol_screener_history(symbol: str, screener: Optional[str] = None,
+                            limit: int = Query(50, ge=1, le=500), offset: int = Query(0, ge=0)):
+    """Every screener match of a symbol across runs, newest first"""
+    store = get_results_store()
+    return _cached_screener_query(
+        ('history', symbol, screener, limit, offset),
+        lambda: store.symbol_history(symbol, screener, limit, offset)
+    )
+
+def _run_screeners_job(db_params: Dict[str, Any]):
+    from ..screeners.run_screeners import run_all_screeners
+    try:
+        run_all_screeners(db_params, results_store=get_results_store(), save_csv=False,
+                          verbose=False)
+    except Exception as e:
+        print(f"Error running screeners: {e}")
+    finally:
+        _screener_run_lock.release()
+
+@app.post("/screeners/run", status_code=202)
+def trigger_screener_run(background_tasks: BackgroundTasks):
+    """Start a run of all screeners in the background; results appear when it completes"""
+    if not SCREENER_DB_PARAMS:
+        raise HTTPException(status_code=503, detail="SCREENER_DB_PARAMS is not configured")
+    db_params = json.loads(SCREENER_DB_PARAMS)
+    if not _screener_run_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A screener run is already in progress")
+    background_tasks.add_task(_run_screeners_job, db_params)
+    return {'status': 'started'}
+
+_live_feed_task: Optional[asyncio.Task] = None
+
+def _live_feed_done(task: asyncio.Task):
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Live feed stopped: {task.exception()!r}")
+
+@app.on_event("startup")
+async def start_live_feed():
+    global _live_feed_task
+    if LIVE_FEED_DIR:
+        interval = float(os.environ.get('LIVE_FEED_INTERVAL', '1.0'))
+        _live_feed_task = asyncio.get_event_loop().create_task(
+            signal_hub.run(FileReplayFeed(LIVE_FEED_DIR, interval=interval, loop=True))
+        )
+        _live_feed_task.add_done_callback(_live_feed_done)
+
+@app.websocket("/ws/signals")
+async def live_signals(websocket: WebSocket):
+    """
+    Live signal stream. Clients send
+        {"action": "subscribe", "symbol": "AAPL", "strategy": "MovingAverageCrossover", "params": {...}}
+        {"action": "unsubscribe", "symbol": ..., "strategy": ..., "params": {...}}
+    and receive {"type": "signal", ...} messages whenever a subscribed signal changes.
+    """
+    await websocket.accept()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+    subscriptions = set()
+    
+    async def sender():
+        while True:
+            await websocket.send_text(await queue.get())
+    
+    sender_task = asyncio.ensure_future(sender())
+    try:
+        while True:
+            text = await websocket.receive_text()
+            # A bad request is reported to the client, it never closes the connection
+            try:
+                message = json.loads(text)
+                if not isinstance(message, dict):
+                    raise ValueError("Expected a JSON object")
+                args = (message.get('symbol'), message.get('strategy'), message.get('params') or {})
+                if message.get('action') == 'subscribe':
+                    subscriptions.add(signal_hub.subscribe(queue, *args))
+                elif message.get('action') == 'unsubscribe':
+                    key = signal_hub.key(*args)
+                    signal_hub.unsubscribe(queue, key)
+                    subscriptions.discard(key)
+            except Exception as e:
+                signal_hub.send(queue, json.dumps({'type': 'error', 'detail': str(e)}))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender_task.cancel()
+        for key in subscriptions:
+            signal_hub.unsubscribe(queue, key)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,90 +1,231 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from ..strategies.base_strategy import BaseStrategy
+from ..strategies.ensemble_strategy import EnsembleStrategy
+from ..features.resampler import BarResampler, parse_timeframe, periods_per_year, resample_bars
+from ..utils.compact import to_compact, MemoryTracker, OHLCV_COLUMNS
+from ..utils import instrumentation
+
+# Result key used for the combined ensemble signal column
+ENSEMBLE_COLUMN = '__ensemble__'
 
 class BacktestEngine:
     def __init__(self, 
                  initial_capital: float = 100000.0,
-                 commission: float = 0.0):
+                 commission: float = 0.0,
+                 compact: bool = False,
+                 resampler: Optional[BarResampler] = None):
         self.initial_capital = initial_capital
         self.commission = commission
+        self.compact = compact
+        self.resampler = resampler
         self.portfolio_value = []
         self.trades = []
     
-    def run(self, data: pd.DataFrame, strategy: BaseStrategy) -> Dict[str, Any]:
+    def run(self, data: pd.DataFrame, strategy: BaseStrategy,
+            timeframe: Optional[str] = None) -> Dict[str, Any]:
         """
         Run backtest for a given strategy
         
         Args:
             data (pd.DataFrame): Historical price data
             strategy (BaseStrategy): Trading strategy instance
+            timeframe (str): Resample data to this timeframe ('1w', '1mo', '15min', ...) first
             
         Returns:
             Dict[str, Any]: Backtest results including returns, sharpe ratio, etc.
+                The Sharpe ratio is annualized by the bars per year of the timeframe,
+                or of data.attrs['interval'] (daily if unset), reported as 'periods_per_year'
         """
-        # Generate signals
-        df = strategy.generate_signals(data)
+        memory = MemoryTracker()
+        memory.record('input', data)
+        data = self._bars(data, timeframe)
+        if self.compact:
+            # Only OHLCV columns, as float32
+            data = to_compact(data, OHLCV_COLUMNS)
+            memory.record('compact_input', data)
         
-        # Initialize portfolio metrics
-        position = 0
-        capital = self.initial_capital
-        self.portfolio_value = [capital]
+        # Generate signals
+        with instrumentation.timer('signal_generation', strategy=type(strategy).__name__):
+            df = strategy.generate_signals(data)
+        memory.record('signals', df)
         
         # Simulate trading
-        for i in range(1, len(df)):
-            signal = df['signal'].iloc[i]
-            price = df['close'].iloc[i]
+        with instrumentation.timer('simulation'):
+            equity, trades = self._simulate(
+                df['close'].to_numpy(),
+                df['signal'].to_numpy()[:, None],
+                df.index
+            )
+        self.portfolio_value = equity[:, 0].tolist()
+        self.trades.extend(trades[0])
+        
+        results = self._results(self.portfolio_value, self.trades, self._periods_per_year(data))
+        results['memory'] = memory.report()
+        
+        return results
+    
+    def run_many(self, data: pd.DataFrame, strategies: Dict[str, BaseStrategy],
+                 timeframe: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Backtest several strategies against one shared read-only view of the data
+        in a single simulation pass
+        
+        Args:
+            data (pd.DataFrame): Historical price data
+            strategies (Dict[str, BaseStrategy]): Strategy instances by name
+            timeframe (str): Resample data to this timeframe first
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Backtest results per strategy name
+        """
+        data = self._bars(data, timeframe)
+        if self.compact:
+            data = to_compact(data, OHLCV_COLUMNS)
+        ensemble = EnsembleStrategy(strategies)
+        with instrumentation.timer('signal_generation', strategy='EnsembleStrategy'):
+            signals = ensemble.constituent_signals(data)
+        return self._run_signals(data, signals)
+    
+    def run_ensemble(self, data: pd.DataFrame, ensemble: EnsembleStrategy,
+                     timeframe: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Backtest an ensemble and all of its constituents in a single pass: one
+        data view, one signal evaluation per constituent and one simulation loop
+        
+        Args:
+            data (pd.DataFrame): Historical price data
+            ensemble (EnsembleStrategy): Ensemble strategy instance
+            timeframe (str): Resample data to this timeframe first
+            
+        Returns:
+            Dict[str, Any]: {'ensemble': results, 'constituents': {name: results}}
+        """
+        data = self._bars(data, timeframe)
+        if self.compact:
+            data = to_compact(data, OHLCV_COLUMNS)
+        with instrumentation.timer('signal_generation', strategy=type(ensemble).__name__):
+            signals = ensemble.constituent_signals(data)
+            combined = ensemble.combine(signals)
+        signals[ENSEMBLE_COLUMN] = combined
+        results = self._run_signals(data, signals)
+        return {
+            'ensemble': results.pop(ENSEMBLE_COLUMN),
+            'constituents': results
+        }
+    
+    @staticmethod
+    def _periods_per_year(data: pd.DataFrame) -> float:
+        """Annualization factor of the simulated bars (resampled timeframe, else base interval)"""
+        return periods_per_year(data.attrs.get('timeframe') or data.attrs.get('interval') or '1d')
+    
+    def _bars(self, data: pd.DataFrame, timeframe: Optional[str]) -> pd.DataFrame:
+        """Data at the requested timeframe, from the resampler cache when the symbol is known"""
+        if timeframe is None:
+            return data
+        symbol = data.attrs.get('symbol')
+        # Label by timeframe kind: raw strings would give every '17min' its own series
+        with instrumentation.timer('resample', timeframe=parse_timeframe(timeframe)[0]):
+            if self.resampler is None or symbol is None:
+                return resample_bars(data, timeframe)
+            return self.resampler.get(symbol, data, timeframe)
+    
+    def _run_signals(self, data: pd.DataFrame, signals: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+        """Simulate every signal column side by side over the same prices"""
+        with instrumentation.timer('simulation'):
+            equity, trades = self._simulate(
+                data['close'].to_numpy(),
+                signals.to_numpy(),
+                data.index
+            )
+        periods = self._periods_per_year(data)
+        return {
+            name: self._results(equity[:, j].tolist(), trades[j], periods)
+            for j, name in enumerate(signals.columns)
+        }
+    
+    def _simulate(self, close: np.ndarray, signals: np.ndarray, index: pd.Index) -> tuple:
+        """
+        Simulate N signal columns over one price series in a single loop
+        
+        Args:
+            close (np.ndarray): Close prices, shape (T,)
+            signals (np.ndarray): Signals, shape (T, N)
+            index (pd.Index): Bar dates
+            
+        Returns:
+            tuple: Equity curves of shape (max(T, 1), N) and one trade list per column
+        """
+        n_bars, n_strategies = signals.shape
+        position = np.zeros(n_strategies)
+        capital = np.full(n_strategies, self.initial_capital, dtype=np.float64)
+        equity = np.empty((max(n_bars, 1), n_strategies))
+        equity[0] = capital
+        trades = [[] for _ in range(n_strategies)]
+        
+        for i in range(1, n_bars):
+            signal = signals[i]
+            price = close[i]
             
             # Execute trades based on signals
-            if signal == 1 and position <= 0:  # Buy signal
-                position = capital / price
-                trade_cost = position * price * self.commission
-                capital -= trade_cost
-                self.trades.append({
-                    'date': df.index[i],
-                    'type': 'buy',
-                    'price': price,
-                    'size': position
-                })
+            buy = (signal == 1) & (position <= 0)
+            if buy.any():
+                position[buy] = capital[buy] / price
+                trade_cost = position[buy] * price * self.commission
+                capital[buy] -= trade_cost
+                for j in np.flatnonzero(buy):
+                    trades[j].append({
+                        'date': index[i],
+                        'type': 'buy',
+                        'price': price,
+                        'size': position[j]
+                    })
             
-            elif signal == -1 and position > 0:  # Sell signal
-                trade_cost = position * price * self.commission
-                capital = position * price - trade_cost
-                position = 0
-                self.trades.append({
-                    'date': df.index[i],
-                    'type': 'sell',
-                    'price': price,
-                    'size': position
-                })
+            sell = (signal == -1) & (position > 0)
+            if sell.any():
+                value = position[sell] * price
+                trade_cost = value * self.commission
+                capital[sell] = value - trade_cost
+                position[sell] = 0
+                for j in np.flatnonzero(sell):
+                    trades[j].append({
+                        'date': index[i],
+                        'type': 'sell',
+                        'price': price,
+                        'size': position[j]
+                    })
             
             # Update portfolio value
-            current_value = capital if position == 0 else position * price
-            self.portfolio_value.append(current_value)
+            equity[i] = np.where(position == 0, capital, position * price)
         
-        # Calculate metrics
-        returns = pd.Series(self.portfolio_value).pct_change().dropna()
+        return equity, trades
+    
+    def _results(self, portfolio_value: list, trades: list,
+                 periods_per_year: float = 252) -> Dict[str, Any]:
+        """Calculate metrics for one equity curve"""
+        returns = pd.Series(portfolio_value).pct_change().dropna()
         
-        results = {
-            'total_return': (self.portfolio_value[-1] - self.initial_capital) / self.initial_capital,
-            'sharpe_ratio': self._calculate_sharpe_ratio(returns),
-            'max_drawdown': self._calculate_max_drawdown(),
-            'trades': self.trades,
-            'equity_curve': self.portfolio_value
+        return {
+            'total_return': (portfolio_value[-1] - self.initial_capital) / self.initial_capital,
+            'sharpe_ratio': self._calculate_sharpe_ratio(returns, periods_per_year),
+            'periods_per_year': periods_per_year,
+            'max_drawdown': self._calculate_max_drawdown(portfolio_value),
+            'trades': trades,
+            'equity_curve': portfolio_value
         }
-        
-        return results
     
-    def _calculate_sharpe_ratio(self, returns: pd.Series) -> float:
-        """Calculate annualized Sharpe ratio"""
+    def _calculate_sharpe_ratio(self, returns: pd.Series, periods_per_year: float = 252) -> float:
+        """Calculate annualized Sharpe ratio of per-bar returns"""
         if len(returns) == 0:
             return 0.0
-        return np.sqrt(252) * returns.mean() / returns.std()
+        return np.sqrt(periods_per_year) * returns.mean() / returns.std()
     
-    def _calculate_max_drawdown(self) -> float:
+    def _calculate_max_drawdown(self, portfolio_value: list = None) -> float:
         """Calculate maximum drawdown"""
-        portfolio_series = pd.Series(self.portfolio_value)
+        portfolio_series = pd.Series(
+            self.portfolio_value if portfolio_value is None else portfolio_value
+        )
         rolling_max = portfolio_series.expanding().max()
         drawdowns = portfolio_series / rolling_max - 1.0
         return drawdowns.min()
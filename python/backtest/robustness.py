@@ -0,0 +1,212 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Paths simulated per batch; bounds memory at chunk_size * n_bars floats per array
+CHUNK_SIZE = 1000
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def path_metrics(returns: np.ndarray, initial_capital: float,
+                 periods_per_year: int = 252) -> Dict[str, np.ndarray]:
+    """
+    Sharpe ratio, max drawdown and final equity of every row of a returns matrix
+
+    Args:
+        returns (np.ndarray): Per-period returns, shape (n_paths, n_periods)
+        initial_capital (float): Starting equity of each path
+        periods_per_year (int): Annualization factor for the Sharpe ratio
+
+    Returns:
+        Dict[str, np.ndarray]: One value per path for each metric
+    """
+    equity = initial_capital * np.cumprod(1.0 + returns, axis=1)
+    running_max = np.maximum(np.maximum.accumulate(equity, axis=1), initial_capital)
+    max_drawdown = np.minimum((equity / running_max - 1.0).min(axis=1), 0.0)
+
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1) if returns.shape[1] > 1 else np.zeros(len(returns))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, np.sqrt(periods_per_year) * mean / std, 0.0)
+
+    return {
+        'sharpe_ratio': sharpe,
+        'max_drawdown': max_drawdown,
+        'final_equity': equity[:, -1] if returns.shape[1] else np.full(len(returns), initial_capital)
+    }
+
+
+def trade_returns(trades: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Entry and exit prices of closed round trips in a BacktestEngine trade list
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Buy prices and matching sell prices
+    """
+    entries, exits = [], []
+    entry = None
+    for trade in trades:
+        if trade['type'] == 'buy':
+            entry = float(trade['price'])
+        elif trade['type'] == 'sell' and entry is not None:
+            entries.append(entry)
+            exits.append(float(trade['price']))
+            entry = None
+    return np.array(entries), np.array(exits)
+
+
+def _trades_per_year(n_round_trips: int, years: float) -> float:
+    """Round trips per year over the backtest period"""
+    return n_round_trips / years if years > 0 else float(n_round_trips)
+
+
+def _block_bootstrap_chunk(n_paths: int, seed: np.random.SeedSequence, returns: np.ndarray,
+                           block_size: int, initial_capital: float,
+                           periods_per_year: int) -> Dict[str, np.ndarray]:
+    """Moving block bootstrap: paths are concatenated random blocks of the original returns"""
+    rng = np.random.default_rng(seed)
+    n_bars = len(returns)
+    block_size = max(1, min(block_size, n_bars))
+    n_blocks = -(-n_bars // block_size)
+    starts = rng.integers(0, n_bars - block_size + 1, size=(n_paths, n_blocks))
+    index = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :n_bars]
+    return path_metrics(returns[index], initial_capital, periods_per_year)
+
+
+def _trade_shuffle_chunk(n_paths: int, seed: np.random.SeedSequence, entries: np.ndarray,
+                         exits: np.ndarray, commission: float,
+                         commission_range: Tuple[float, float], slippage_bps: float,
+                         initial_capital: float, trades_per_year: float) -> Dict[str, np.ndarray]:
+    """
+    Shuffle the order of round trips and perturb their costs: each fill gets a
+    random adverse slippage and each path a random commission multiplier
+    """
+    rng = np.random.default_rng(seed)
+    n_trades = len(entries)
+    order = rng.permuted(np.tile(np.arange(n_trades), (n_paths, 1)), axis=1)
+
+    slip = np.abs(rng.normal(0.0, slippage_bps / 10000.0, size=(2, n_paths, n_trades)))
+    path_commission = commission * rng.uniform(*commission_range, size=(n_paths, 1))
+    buy = entries[order] * (1.0 + slip[0])
+    sell = exits[order] * (1.0 - slip[1])
+    # Same accounting as BacktestEngine: commission is charged on the exit value
+    returns = sell / buy * (1.0 - path_commission) - 1.0
+    return path_metrics(returns, initial_capital, trades_per_year)
+
+
+def _summarize(values: np.ndarray, confidence: float, bins: int = 50) -> Dict[str, Any]:
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return {}
+    alpha = (1.0 - confidence) / 2
+    counts, edges = np.histogram(values, bins=bins)
+    return {
+        'mean': float(values.mean()),
+        'std': float(values.std()),
+        'ci_low': float(np.quantile(values, alpha)),
+        'ci_high': float(np.quantile(values, 1 - alpha)),
+        'percentiles': {str(p): float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
+        'histogram': {'counts': counts.tolist(), 'edges': edges.tolist()}
+    }
+
+
+def _run_chunks(func, args: tuple, n_paths: int, seed: Optional[int], n_jobs: int) -> Dict[str, np.ndarray]:
+    """Split n_paths into chunks with independent seeds and run them, in parallel if n_jobs > 1"""
+    sizes = [min(CHUNK_SIZE, n_paths - start) for start in range(0, n_paths, CHUNK_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    jobs = [(size, s) + args for size, s in zip(sizes, seeds)]
+
+    if n_jobs == 1 or len(jobs) == 1:
+        parts = [func(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs if n_jobs > 0 else os.cpu_count()) as executor:
+            parts = list(executor.map(func, *zip(*jobs)))
+
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def analyze(returns: Sequence[float],
+            trades: List[Dict[str, Any]],
+            initial_capital: float = 100000.0,
+            commission: float = 0.0,
+            n_paths: int = 10000,
+            block_size: int = 20,
+            slippage_bps: float = 5.0,
+            commission_range: Tuple[float, float] = (0.5, 2.0),
+            confidence: float = 0.95,
+            periods_per_year: int = 252,
+            n_jobs: int = 1,
+            seed: Optional[int] = None,
+            return_paths: bool = False,
+            years: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Resampling robustness analysis of a backtest
+
+    Two families of paths are simulated as batched array computations:
+    - bootstrap: moving block bootstrap of the per-period returns
+    - trade_shuffle: shuffled round-trip order with slippage and commission perturbation
+
+    Args:
+        returns: Per-period strategy returns
+        trades: BacktestEngine trade list
+        initial_capital (float): Starting equity
+        commission (float): Commission rate used in the backtest
+        n_paths (int): Paths per family
+        block_size (int): Bootstrap block length in periods
+        slippage_bps (float): Scale of the random adverse slippage per fill, in basis points
+        commission_range (Tuple[float, float]): Range of the per-path commission multiplier
+        confidence (float): Confidence level of the reported intervals
+        periods_per_year (int): Annualization factor for the bootstrap Sharpe ratio
+        n_jobs (int): Worker processes (-1 for all cores)
+        seed (int): Seed for reproducible paths (independent of n_jobs)
+        return_paths (bool): Include the raw per-path metric arrays
+        years (float): Length of the backtest period in years, len(returns) /
+            periods_per_year if omitted
+
+    Returns:
+        Dict[str, Any]: Per family and metric: mean, std, confidence interval,
+            percentiles and histogram, plus the probability of a loss. Trade-shuffle
+            Sharpe ratios use per-trade returns annualized by trades per year.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if years is None:
+        years = len(returns) / periods_per_year
+    returns = returns[np.isfinite(returns)]
+    seeds = np.random.SeedSequence(seed).generate_state(2)
+    results: Dict[str, Any] = {'n_paths': n_paths, 'confidence': confidence}
+
+    families = {}
+    if len(returns) > 1:
+        families['bootstrap'] = _run_chunks(
+            _block_bootstrap_chunk,
+            (returns, block_size, initial_capital, periods_per_year),
+            n_paths, int(seeds[0]), n_jobs
+        )
+
+    entries, exits = trade_returns(trades)
+    if len(entries) > 0:
+        families['trade_shuffle'] = _run_chunks(
+            _trade_shuffle_chunk,
+            (entries, exits, commission, tuple(commission_range), slippage_bps,
+             initial_capital, _trades_per_year(len(entries), years)),
+            n_paths, int(seeds[1]), n_jobs
+        )
+
+    for family, metrics in families.items():
+        results[family] = {name: _summarize(values, confidence) for name, values in metrics.items()}
+        results[family]['prob_loss'] = float((metrics['final_equity'] < initial_capital).mean())
+        if return_paths:
+            results[family]['paths'] = metrics
+
+    return results
+
+
+def analyze_backtest(results: Dict[str, Any], initial_capital: float = 100000.0,
+                     commission: float = 0.0, **kwargs) -> Dict[str, Any]:
+    """Run analyze() on the output of BacktestEngine.run, annualized like its Sharpe ratio"""
+    returns = pd.Series(results['equity_curve']).pct_change().dropna().to_numpy()
+    kwargs.setdefault('periods_per_year', results.get('periods_per_year', 252))
+    return analyze(returns, results['trades'], initial_capital, commission, **kwargs)
@@ -0,0 +1,10 @@
+"""
+Performance Benchmarks
+
+Deterministic synthetic market data, a local historical_data fixture and a
+benchmark runner covering the backtester, strategies and screeners.
+
+Run from the repository root:
+    python -m python.benchmarks.run_benchmarks --save baseline.json
+    python -m python.benchmarks.run_benchmarks --compare baseline.json
+"""
@@ -0,0 +1,76 @@
+import sqlite3
+from typing import Any, Dict
+
+import pandas as pd
+
+def _rows(universe: Dict[str, pd.DataFrame], date_format: str = None):
+    for symbol, df in universe.items():
+        dates = df.index.strftime(date_format) if date_format else df.index.to_pydatetime()
+        for date, row in zip(dates, df[['open', 'high', 'low', 'close', 'volume']].itertuples(index=False)):
+            yield (symbol, date, float(row.open), float(row.high), float(row.low),
+                   float(row.close), int(row.volume))
+
+
+def create_sqlite_fixture(path: str, universe: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Write a universe into a SQLite historical_data table
+
+    Args:
+        path (str): SQLite database file (replaced tables, not the file)
+        universe (Dict[str, pd.DataFrame]): OHLCV frames by symbol
+
+    Returns:
+        Dict[str, Any]: db_params for BaseScreener
+    """
+    with sqlite3.connect(path) as conn:
+        conn.execute("DROP TABLE IF EXISTS historical_data")
+        conn.execute("""
+            CREATE TABLE historical_data (
+                symbol TEXT NOT NULL,
+                date TEXT NOT NULL,
+                open REAL, high REAL, low REAL, close REAL,
+                volume INTEGER,
+                PRIMARY KEY (symbol, date)
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO historical_data VALUES (?, ?, ?, ?, ?, ?, ?)",
+            _rows(universe, '%Y-%m-%d %H:%M:%S')
+        )
+    return {'sqlite_path': path}
+
+
+def load_postgres_fixture(db_params: Dict[str, Any], universe: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
+    """
+    Replace the universe's symbols in a PostgreSQL historical_data table
+
+    Args:
+        db_params (Dict[str, Any]): psycopg2 connection parameters of a scratch database
+        universe (Dict[str, pd.DataFrame]): OHLCV frames by symbol
+
+    Returns:
+        Dict[str, Any]: db_params for BaseScreener
+    """
+    import psycopg2
+    from psycopg2.extras import execute_values
+
+    with psycopg2.connect(**db_params) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS historical_data (
+                    symbol TEXT NOT NULL,
+                    date TIMESTAMP NOT NULL,
+                    open DOUBLE PRECISION, high DOUBLE PRECISION,
+                    low DOUBLE PRECISION, close DOUBLE PRECISION,
+                    volume BIGINT,
+                    PRIMARY KEY (symbol, date)
+                )
+            """)
+            cur.execute("DELETE FROM historical_data WHERE symbol = ANY(%s)", (list(universe),))
+            execute_values(
+                cur,
+                "INSERT INTO historical_data (symbol, date, open, high, low, close, volume) VALUES %s",
+                _rows(universe),
+                page_size=10000
+            )
+    return db_params
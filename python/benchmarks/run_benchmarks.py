@@ -0,0 +1,338 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .synthetic import generate_ohlcv, generate_universe
+from .fixtures import create_sqlite_fixture
+
+# (bars, frequency) cases for single-symbol benchmarks and universe sizes for screeners
+PROFILES = {
+    'quick': {
+        'series': [(252, '1d'), (2520, '1d'), (7500, '5min')],
+        'universes': [10],
+        'lstm_bars': [500],
+        'rounds': 5
+    },
+    'full': {
+        'series': [(252, '1d'), (2520, '1d'), (5040, '1d'), (10000, '1h'), (75000, '5min')],
+        'universes': [10, 100, 500],
+        'lstm_bars': [500, 2520],
+        'rounds': 7
+    }
+}
+
+# Allowed slowdown of the fastest round versus the baseline before a case counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+SCREENERS = {
+    'technical': ['momentum_screener', 'breakout_screener', 'trend_following_screener'],
+    'advanced': ['volume_breakout_screener', 'rsi_divergence_screener',
+                 'multi_timeframe_trend_screener', 'volatility_breakout_screener',
+                 'momentum_reversal_screener']
+}
+
+
+class Case:
+    def __init__(self, name: str, setup: Callable[[], Callable[[], Any]], threshold: float = None):
+        """
+        One benchmark case
+
+        Args:
+            name (str): Stable case name used as baseline key
+            setup: Builds inputs (not timed) and returns the callable to time
+            threshold (float): Case-specific regression threshold
+        """
+        self.name = name
+        self.setup = setup
+        self.threshold = threshold
+
+
+def measure(func: Callable[[], Any], rounds: int, min_round_s: float = 0.05) -> Dict[str, float]:
+    """
+    Per-call wall-clock timings of func over several rounds
+
+    Fast callables are repeated within a round until it lasts min_round_s
+    (as timeit.autorange does) so sub-millisecond cases are not timer noise.
+    """
+    func()  # warm-up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_round_s:
+            break
+        number *= 2
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        'median_s': statistics.median(timings),
+        'min_s': min(timings),
+        'mean_s': statistics.fmean(timings),
+        'rounds': rounds,
+        'calls_per_round': number
+    }
+
+
+def _series_cases(bars: int, freq: str) -> List[Case]:
+    from ..backtest.backtest_engine import BacktestEngine
+    from ..strategies.moving_average_strategy import MovingAverageCrossoverStrategy
+
+    tag = f"bars={bars},freq={freq}"
+
+    def backtest():
+        data = generate_ohlcv('BENCH', bars, freq)
+        strategy = MovingAverageCrossoverStrategy()
+        # Fresh engine per call, BacktestEngine.trades accumulates across runs
+        return lambda: BacktestEngine(commission=0.001).run(data, strategy)
+
+    def signals():
+        data = generate_ohlcv('BENCH', bars, freq)
+        strategy = MovingAverageCrossoverStrategy()
+        return lambda: strategy.generate_signals(data)
+
+    def indicators():
+        from ..screeners.base_screener import BaseScreener
+        data = generate_ohlcv('BENCH', bars, freq).reset_index()
+        screener = BaseScreener({})
+        return lambda: screener.calculate_technical_indicators(data.copy())
+
+    return [
+        Case(f"backtest_engine.run[{tag}]", backtest),
+        Case(f"moving_average.generate_signals[{tag}]", signals),
+        Case(f"base_screener.calculate_technical_indicators[{tag}]", indicators)
+    ]
+
+
+def _screener_cases(n_symbols: int, workdir: str) -> List[Case]:
+    tag = f"symbols={n_symbols}"
+    fixture: Dict[str, Any] = {}
+
+    def db_params():
+        if 'db_params' not in fixture:
+            path = os.path.join(workdir, f"historical_data_{n_symbols}.sqlite")
+            # Screeners read the last N calendar days up to now and need N bars, so the fixture
+            # has a bar on every calendar day ending today; only the dates move between days
+            universe = generate_universe(n_symbols, 300, end=pd.Timestamp.now(), weekends=True)
+            fixture['db_params'] = create_sqlite_fixture(path, universe)
+        return fixture['db_params']
+
+    def screener_case(kind: str, method: str):
+        def setup():
+            from ..screeners.technical_screener import TechnicalScreener
+            from ..screeners.advanced_screener import AdvancedScreener
+            cls = TechnicalScreener if kind == 'technical' else AdvancedScreener
+            screener = cls(db_params())
+            getattr(screener, method)()
+            # A screener that skips every symbol would time nothing but the queries
+            if screener.indicator_calls < n_symbols:
+                raise RuntimeError(f"{method} computed indicators for {screener.indicator_calls} "
+                                   f"of {n_symbols} fixture symbols")
+            return getattr(screener, method)
+        return Case(f"screener.{kind}.{method}[{tag}]", setup)
+
+    def run_all():
+        from ..screeners.run_screeners import run_all_screeners
+        params = db_params()
+
+        def call():
+            # run_all_screeners writes CSVs to the working directory and prints frames
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    return run_all_screeners(params)
+            finally:
+                os.chdir(cwd)
+
+        if not any(call().values()):
+            raise RuntimeError("run_all_screeners found no matches on the fixture")
+        return call
+
+    def resample_universe():
+        from ..features.resampler import resample_bars
+        universe = pd.concat(generate_universe(n_symbols, 300), names=['symbol', 'date']).reset_index()
+        return lambda: resample_bars(universe, '1w', by='symbol')
+
+    cases = [screener_case(kind, method) for kind, methods in SCREENERS.items() for method in methods]
+    cases.append(Case(f"run_all_screeners[{tag}]", run_all))
+    cases.append(Case(f"resampler.resample_bars[{tag},timeframe=1w]", resample_universe))
+    return cases
+
+
+def _lstm_case(bars: int) -> Case:
+    def setup():
+        from ..strategies.ai_strategies.lstm_strategy import LSTMStrategy
+        data = generate_ohlcv('BENCH', bars)
+        strategy = LSTMStrategy()
+        # Untrained weights: only inference is measured
+        strategy.model = strategy._build_model((strategy.parameters['sequence_length'], 5))
+        return lambda: strategy.generate_signals(data)
+    return Case(f"lstm_strategy.inference[bars={bars}]", setup)
+
+
+def _compact_check(bars: int, freq: str) -> Tuple[str, Callable[[], Dict[str, float]]]:
+    def check():
+        from ..screeners.base_screener import BaseScreener
+        from ..utils.compact import compact_deviations, to_compact
+        data = generate_ohlcv('BENCH', bars, freq).reset_index()
+        reference = BaseScreener({}).calculate_technical_indicators(data.copy())
+        compact = BaseScreener({}, compact=True).calculate_technical_indicators(to_compact(data))
+        return {c: d for c, d in compact_deviations(reference, compact).items() if d > 1}
+    return f"compact_tolerances[bars={bars},freq={freq}]", check
+
+
+def build_checks(profile: Dict[str, Any]) -> List[Tuple[str, Callable[[], Dict[str, float]]]]:
+    """Correctness checks run alongside the timings; each returns its failures"""
+    return [_compact_check(bars, freq) for bars, freq in profile['series']]
+
+
+def build_cases(profile: Dict[str, Any], workdir: str) -> List[Case]:
+    cases = []
+    for bars, freq in profile['series']:
+        cases.extend(_series_cases(bars, freq))
+    for n_symbols in profile['universes']:
+        cases.extend(_screener_cases(n_symbols, workdir))
+    for bars in profile['lstm_bars']:
+        cases.append(_lstm_case(bars))
+    return cases
+
+
+def run(profile_name: str, pattern: Optional[str] = None) -> Dict[str, Any]:
+    """Run every case of a profile (optionally filtered by substring) and collect timings"""
+    profile = PROFILES[profile_name]
+    results, skipped = {}, {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for case in build_cases(profile, workdir):
+            if pattern and pattern not in case.name:
+                continue
+            try:
+                func = case.setup()
+            except ImportError as e:
+                skipped[case.name] = f"missing dependency: {e.name or e}"
+                print(f"SKIP {case.name} ({skipped[case.name]})")
+                continue
+            timing = measure(func, profile['rounds'])
+            timing['threshold'] = case.threshold or DEFAULT_THRESHOLD
+            results[case.name] = timing
+            print(f"{timing['min_s'] * 1000:10.2f} ms  (median {timing['median_s'] * 1000:.2f} ms)  {case.name}")
+
+    checks = {}
+    for name, check in build_checks(profile):
+        if pattern and pattern not in name:
+            continue
+        try:
+            failures = check()
+        except ImportError as e:
+            skipped[name] = f"missing dependency: {e.name or e}"
+            print(f"SKIP {name} ({skipped[name]})")
+            continue
+        checks[name] = failures
+        status = 'FAIL ' + ', '.join(f"{c} {d:.1f}x tolerance" for c, d in failures.items()) if failures else 'ok'
+        print(f"{'check':>13}  {name}: {status}")
+
+    return {
+        'meta': {
+            'profile': profile_name,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'timestamp': pd.Timestamp.now().isoformat()
+        },
+        'results': results,
+        'checks': checks,
+        'skipped': skipped
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: Optional[float] = None, pattern: Optional[str] = None) -> List[str]:
+    """
+    Compare timings against a baseline
+
+    The fastest round is compared since it is the least affected by other
+    load on the machine; medians are reported for context.
+
+    Args:
+        pattern (str): Case filter of the current run; baseline cases outside it are ignored
+
+    Returns:
+        List[str]: Names of cases slower than baseline * (1 + threshold), and of
+            baseline cases that were skipped or missing in the current run
+    """
+    regressions = []
+    print(f"\n{'baseline':>12} {'current':>12} {'change':>8}  case")
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f"{'-':>12} {result['min_s'] * 1000:10.2f}ms {'new':>8}  {name}")
+            continue
+        limit = threshold if threshold is not None else base.get('threshold', DEFAULT_THRESHOLD)
+        change = result['min_s'] / base['min_s'] - 1
+        flag = '  REGRESSION' if change > limit else ''
+        if flag:
+            regressions.append(name)
+        print(f"{base['min_s'] * 1000:10.2f}ms {result['min_s'] * 1000:10.2f}ms "
+              f"{change:+8.1%}  {name}{flag}")
+
+    for name, base in baseline['results'].items():
+        if name in current['results'] or (pattern and pattern not in name):
+            continue
+        reason = current['skipped'].get(name, 'not run')
+        print(f"{base['min_s'] * 1000:10.2f}ms {'-':>12} {'missing':>8}  {name} ({reason})")
+        regressions.append(name)
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run performance benchmarks")
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('-k', '--filter', help="Only run cases whose name contains this string")
+    parser.add_argument('--save', help="Write results as a JSON baseline to this path")
+    parser.add_argument('--compare', help="Compare against a JSON baseline; exit 1 on regression "
+                                          "or on baseline cases missing from this run")
+    parser.add_argument('--threshold', type=float,
+                        help="Override the allowed slowdown, e.g. 0.25 for 25%%")
+    args = parser.parse_args(argv)
+
+    current = run(args.profile, args.filter)
+    failed_checks = [name for name, failures in current['checks'].items() if failures]
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"\nResults saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.filter)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond threshold or missing cases")
+            return 1
+        print("\nNo regressions")
+    if failed_checks:
+        print(f"\n{len(failed_checks)} correctness check(s) failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,105 @@
+import zlib
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# NSE cash session, used to lay out intraday bars
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)
+SESSION_MINUTES = 375
+
+FREQUENCY_MINUTES = {'1d': None, '1h': 60, '15min': 15, '5min': 5, '1min': 1}
+
+# Last session of generated series unless end is given, so frames do not change from day to day
+DEFAULT_END = pd.Timestamp('2024-12-31')
+
+
+def _rng(symbol: str, seed: int) -> np.random.Generator:
+    return np.random.default_rng([seed, zlib.crc32(symbol.encode('utf-8'))])
+
+
+def bar_times(n_bars: int, freq: str = '1d', end=None, weekends: bool = False) -> pd.DatetimeIndex:
+    """
+    Timestamps of the last n_bars bars ending at end on weekdays
+
+    Args:
+        n_bars (int): Number of bars
+        freq (str): One of FREQUENCY_MINUTES
+        end: Last session date, DEFAULT_END if omitted
+        weekends (bool): Trade every calendar day instead of weekdays only
+    """
+    if freq not in FREQUENCY_MINUTES:
+        raise ValueError(f"Unsupported frequency: {freq}")
+    end = pd.Timestamp(DEFAULT_END if end is None else end).normalize()
+    sessions = pd.date_range if weekends else pd.bdate_range
+    step = FREQUENCY_MINUTES[freq]
+    if step is None:
+        return sessions(end=end, periods=n_bars)
+
+    bars_per_day = -(-SESSION_MINUTES // step)
+    days = sessions(end=end, periods=-(-n_bars // bars_per_day))
+    offsets = SESSION_OPEN + pd.to_timedelta(np.arange(bars_per_day) * step, unit='min')
+    times = (days.values[:, None] + offsets.values[None, :]).ravel()
+    return pd.DatetimeIndex(times[-n_bars:])
+
+
+def generate_ohlcv(symbol: str,
+                   n_bars: int,
+                   freq: str = '1d',
+                   end=None,
+                   seed: int = 0,
+                   weekends: bool = False,
+                   start_price: float = 100.0,
+                   annual_drift: float = 0.05,
+                   annual_vol: float = 0.25) -> pd.DataFrame:
+    """
+    Deterministic OHLCV bars following a geometric random walk
+
+    The same (symbol, n_bars, freq, end, seed) always produces the same frame;
+    end and weekends only move the timestamps, never the values.
+    Volume has occasional spikes so breakout screeners find matches.
+
+    Returns:
+        pd.DataFrame: open, high, low, close, volume indexed by bar time
+    """
+    rng = _rng(symbol, seed)
+    step = FREQUENCY_MINUTES[freq]
+    dt = 1 / 252 if step is None else step / (SESSION_MINUTES * 252)
+
+    log_returns = rng.normal((annual_drift - annual_vol ** 2 / 2) * dt,
+                             annual_vol * np.sqrt(dt), n_bars)
+    close = start_price * rng.uniform(0.5, 2.0) * np.exp(np.cumsum(log_returns))
+    prev_close = np.concatenate([[close[0]], close[:-1]])
+    open_ = prev_close * np.exp(rng.normal(0, annual_vol * np.sqrt(dt) / 4, n_bars))
+    wick = np.abs(rng.normal(0, annual_vol * np.sqrt(dt) / 2, (2, n_bars)))
+    high = np.maximum(open_, close) * np.exp(wick[0])
+    low = np.minimum(open_, close) * np.exp(-wick[1])
+
+    base_volume = 1_000_000 * (1.0 if step is None else step / SESSION_MINUTES)
+    volume = base_volume * rng.lognormal(0, 0.4, n_bars)
+    spikes = rng.random(n_bars) < 0.02
+    volume[spikes] *= rng.uniform(2, 5, spikes.sum())
+
+    df = pd.DataFrame({
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume.round().astype(np.int64)
+    }, index=bar_times(n_bars, freq, end, weekends))
+    df.index.name = 'date'
+    df.attrs['symbol'] = symbol
+    return df
+
+
+def generate_universe(n_symbols: int,
+                      n_bars: int,
+                      freq: str = '1d',
+                      end=None,
+                      seed: int = 0,
+                      weekends: bool = False) -> Dict[str, pd.DataFrame]:
+    """Deterministic universe of synthetic symbols SYM0000, SYM0001, ..."""
+    return {
+        f"SYM{i:04d}": generate_ohlcv(f"SYM{i:04d}", n_bars, freq, end, seed, weekends)
+        for i in range(n_symbols)
+    }
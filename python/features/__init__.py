@@ -0,0 +1,17 @@
+"""
+Derived Feature Store
+
+Shared, persistent cache of derived price series (returns, volatility, RSI,
+moving averages) keyed by (symbol, feature name, parameters). Strategies and
+screeners read aligned slices from the store and new bars are computed
+incrementally, so each feature is computed once per bar across the system.
+
+The bar resampler builds weekly, monthly and N-minute OHLCV bars from the base
+series with calendar-aligned periods and extends them as base bars arrive.
+"""
+
+from .feature_store import FeatureStore, compute_feature, register_feature
+from .resampler import BarResampler, parse_timeframe, resample_bars
+
+__all__ = ['FeatureStore', 'compute_feature', 'register_feature',
+           'BarResampler', 'parse_timeframe', 'resample_bars']
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# name -> (function(data, **params) -> pd.Series, warmup(params) -> bars of history needed)
+_FEATURES: Dict[str, Tuple[Callable[..., pd.Series], Callable[[Dict[str, Any]], int]]] = {}
+
+
+def register_feature(name: str, warmup: Callable[[Dict[str, Any]], int]):
+    """
+    Register a derived feature
+
+    Args:
+        name (str): Feature name used in store keys
+        warmup: Callable returning how many bars before the first new bar must
+            be recomputed so the new values match a full-history computation.
+            Recursive (EMA based) features use a multiple of their span, at
+            which the truncated history contributes less than float noise.
+    """
+    def decorator(func):
+        _FEATURES[name] = (func, warmup)
+        return func
+    return decorator
+
+
+def compute_feature(name: str, data: pd.DataFrame, **params) -> pd.Series:
+    """Compute a registered feature over the whole frame, without any caching"""
+    if name not in _FEATURES:
+        raise KeyError(f"Unknown feature: {name}")
+    return _FEATURES[name][0](data, **params)
+
+
+@register_feature('returns', warmup=lambda p: 1)
+def _returns(data: pd.DataFrame, column: str = 'close') -> pd.Series:
+    return data[column].pct_change()
+
+
+@register_feature('volatility', warmup=lambda p: p.get('window', 20))
+def _volatility(data: pd.DataFrame, window: int = 20, column: str = 'close') -> pd.Series:
+    return data[column].pct_change().rolling(window).std()
+
+
+@register_feature('sma', warmup=lambda p: p.get('window', 20))
+def _sma(data: pd.DataFrame, window: int = 20, column: str = 'close') -> pd.Series:
+    return data[column].rolling(window=window).mean()
+
+
+@register_feature('ema', warmup=lambda p: 20 * p.get('window', 20))
+def _ema(data: pd.DataFrame, window: int = 20, column: str = 'close') -> pd.Series:
+    # Same definition as ta.trend.EMAIndicator
+    return data[column].ewm(span=window, min_periods=window, adjust=False).mean()
+
+
+@register_feature('rsi', warmup=lambda p: 40 * p.get('period', 14)
+                  if p.get('method', 'wilder') == 'wilder' else p.get('period', 14) + 1)
+def _rsi(data: pd.DataFrame, period: int = 14, method: str = 'wilder',
+         column: str = 'close') -> pd.Series:
+    """
+    RSI with Wilder smoothing (as ta.momentum.RSIIndicator, used by screeners)
+    or simple rolling means (method='sma', used by LSTMStrategy)
+    """
+    delta = data[column].diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    if method == 'sma':
+        avg_gain = gain.rolling(window=period).mean()
+        avg_loss = loss.rolling(window=period).mean()
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+    avg_gain = gain.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1 / period, min_periods=period, adjust=False).mean()
+    rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    return rsi.where(avg_loss != 0, 100)
+
+
+def _bar_index(data: pd.DataFrame) -> pd.DatetimeIndex:
+    """Screener frames carry dates in a 'date' column, strategy frames in the index"""
+    if 'date' in data.columns:
+        return pd.DatetimeIndex(data['date'])
+    return pd.DatetimeIndex(data.index)
+
+
+# Input columns whose values are fingerprinted to detect revised history
+_INPUT_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _fingerprint(bars: pd.DataFrame, column: Optional[str] = None) -> pd.Series:
+    """Per-bar hash of the input columns (as float64, so dtypes do not matter)"""
+    columns = [c for c in _INPUT_COLUMNS if c in bars.columns]
+    if column is not None and column in bars.columns and column not in columns:
+        columns.append(column)
+    hashes = pd.util.hash_pandas_object(bars[columns].astype(np.float64), index=False)
+    return pd.Series(hashes.to_numpy(), index=bars.index)
+
+
+class FeatureStore:
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None, max_series: int = 256):
+        """
+        Cache of derived feature columns keyed by (symbol, feature, parameters)
+
+        Args:
+            path (str): Directory to persist feature series in, memory only if omitted
+            max_series (int): Series kept in memory; the least recently used are
+                dropped (and reloaded from path when persisted)
+        """
+        self.path = path
+        self.max_series = max_series
+        self._series: 'OrderedDict[Tuple[str, str, str], pd.Series]' = OrderedDict()
+        # key -> per-bar fingerprint of the inputs the stored values were computed from
+        self._inputs: Dict[Tuple[str, str, str], pd.Series] = {}
+        self._lock = threading.RLock()
+        self.bars_computed = 0
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    @classmethod
+    def get_default(cls) -> 'FeatureStore':
+        """Process-wide in-memory store"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    @staticmethod
+    def _params_key(params: Dict[str, Any]) -> str:
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def _file(self, key: Tuple[str, str, str]) -> str:
+        symbol, name, params = key
+        digest = hashlib.sha1(params.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.path, symbol, f"{name}_{digest}.pkl")
+
+    def _load(self, key: Tuple[str, str, str]) -> Optional[pd.Series]:
+        if key in self._series:
+            self._series.move_to_end(key)
+        elif self.path and os.path.exists(self._file(key)):
+            stored = pd.read_pickle(self._file(key))
+            if isinstance(stored, tuple):
+                self._remember(key, *stored)
+            else:
+                # Written without input fingerprints: every bar counts as revised
+                self._remember(key, stored, pd.Series(dtype=np.uint64))
+        return self._series.get(key)
+
+    def _remember(self, key: Tuple[str, str, str], series: pd.Series, inputs: pd.Series):
+        self._series[key] = series
+        self._inputs[key] = inputs
+        self._series.move_to_end(key)
+        while len(self._series) > self.max_series:
+            evicted, _ = self._series.popitem(last=False)
+            self._inputs.pop(evicted, None)
+
+    def _save(self, key: Tuple[str, str, str], series: pd.Series, inputs: pd.Series):
+        self._remember(key, series, inputs)
+        if self.path:
+            os.makedirs(os.path.dirname(self._file(key)), exist_ok=True)
+            pd.to_pickle((series, inputs), self._file(key))
+
+    def get(self, symbol: str, name: str, data: pd.DataFrame, **params) -> pd.Series:
+        """
+        Feature values aligned to the bars in data
+
+        Bars already in the store are served from it; bars after the last
+        stored one are computed from a warm-up window and appended. The last
+        stored bar is recomputed too when its input changed (a bar that was
+        still forming). A frame starting before the stored history, or whose
+        earlier bars differ from the ones the stored values came from (split or
+        dividend adjustments, corrections), triggers a full recompute that
+        replaces the stored series.
+
+        Values are computed over all history the store has seen, so they can
+        differ from a computation over data alone near its first bars.
+
+        Args:
+            symbol (str): Stock symbol
+            name (str): Registered feature name
+            data (pd.DataFrame): OHLCV bars, indexed by date or with a 'date' column;
+                attrs['interval'] (base bar interval) and attrs['timeframe']
+                (resampled bars) keep other bar series under their own keys
+            **params: Feature parameters
+
+        Returns:
+            pd.Series: Feature values with the same index as data
+        """
+        if name not in _FEATURES:
+            raise KeyError(f"Unknown feature: {name}")
+        func, warmup = _FEATURES[name]
+        if len(data) == 0:
+            return pd.Series(dtype=np.float64, index=data.index, name=name)
+        # Other base intervals and resampled bars (see features.resampler) are stored apart
+        bar_series = {k: data.attrs[k] for k in ('interval', 'timeframe')
+                      if data.attrs.get(k) is not None}
+        key = (symbol, name, self._params_key({**params, **bar_series}))
+
+        bars = data.set_axis(_bar_index(data), axis=0)
+        if not bars.index.is_monotonic_increasing:
+            bars = bars.sort_index()
+        bars = bars[~bars.index.duplicated(keep='last')]
+
+        inputs = _fingerprint(bars, params.get('column'))
+        with self._lock:
+            stored = self._load(key)
+            revised = None if stored is None else self._first_revision(key, inputs)
+            if stored is None or len(stored) == 0 or bars.index[0] < stored.index[0] or \
+                    (revised is not None and revised < stored.index[-1]):
+                values = func(bars, **params)
+                self.bars_computed += len(bars)
+                if stored is None or revised is not None:
+                    self._save(key, values, inputs)
+                    stored = values
+                else:
+                    stored = values.combine_first(stored)
+                    self._save(key, stored, self._merge_inputs(key, inputs))
+            elif bars.index[-1] > stored.index[-1] or revised is not None:
+                last = stored.index[-1]
+                first_new = bars.index.searchsorted(last, side='left')
+                start = first_new - warmup(params)
+                values = func(bars.iloc[max(0, start):], **params)
+                self.bars_computed += len(bars) - max(0, start)
+                if start < 0 and bars.index[0] > stored.index[0]:
+                    # Not enough history in data to extend the stored series exactly
+                    return pd.Series(values.reindex(_bar_index(data)).to_numpy(dtype=np.float64),
+                                     index=data.index, name=name)
+                stored = pd.concat([stored[stored.index < last], values[values.index >= last]])
+                self._save(key, stored, self._merge_inputs(key, inputs))
+
+        aligned = stored.reindex(_bar_index(data))
+        return pd.Series(aligned.to_numpy(dtype=np.float64), index=data.index, name=name)
+
+    def _first_revision(self, key: Tuple[str, str, str], inputs: pd.Series) -> Optional[pd.Timestamp]:
+        """
+        First bar within the stored span whose input differs from, or is missing
+        in, the fingerprint the stored values were computed from
+        """
+        stored, known = self._series[key], self._inputs[key]
+        if len(stored) == 0:
+            return None
+        overlap = inputs[(inputs.index >= stored.index[0]) & (inputs.index <= stored.index[-1])]
+        # Positional lookup keeps the uint64 hashes exact (reindex would turn them into floats)
+        position = known.index.get_indexer(overlap.index)
+        changed = position < 0
+        found = ~changed
+        changed[found] = known.to_numpy()[position[found]] != overlap.to_numpy()[found]
+        return overlap.index[changed.argmax()] if changed.any() else None
+
+    def _merge_inputs(self, key: Tuple[str, str, str], inputs: pd.Series) -> pd.Series:
+        known = self._inputs[key]
+        return pd.concat([known[~known.index.isin(inputs.index)], inputs]).sort_index()
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached features for a symbol, or everything if no symbol is given"""
+        with self._lock:
+            for key in [k for k in self._series if symbol is None or k[0] == symbol]:
+                del self._series[key]
+                self._inputs.pop(key, None)
+            if self.path:
+                target = os.path.join(self.path, symbol) if symbol else self.path
+                shutil.rmtree(target, ignore_errors=True)
+                os.makedirs(self.path, exist_ok=True)
@@ -0,0 +1,300 @@
+import math
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .feature_store import _bar_index
+
+# NSE cash session open and length; intraday buckets are aligned to the open
+SESSION_OPEN = pd.Timedelta(hours=9, minutes=15)
+SESSION_MINUTES = 375
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Bars per year of the daily and longer timeframes, including Yahoo Finance interval names
+_PERIODS_PER_YEAR = {'1d': 252, '5d': 252 / 5, '1w': 52, '1wk': 52, '1mo': 12, '3mo': 4}
+
+_TIMEFRAME_ALIASES = {'d': '1d', 'w': '1w', 'm': '1mo', 'mo': '1mo'}
+_INTRADAY = re.compile(r'^(\d+)(min|m|h)$')
+
+# Column (lowercase name) -> how base bars combine into a higher-timeframe bar; others keep the last value
+_AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def parse_timeframe(timeframe: str) -> Tuple[str, Optional[int]]:
+    """
+    Normalize a timeframe string
+
+    Args:
+        timeframe (str): '1d', '1w' or '1mo' (also 'D', 'W', 'M'), or intraday
+            '<N>min' / '<N>h'
+
+    Returns:
+        Tuple[str, Optional[int]]: ('1d' | '1w' | '1mo', None) or ('intraday', minutes)
+    """
+    tf = timeframe.strip().lower()
+    tf = _TIMEFRAME_ALIASES.get(tf, tf)
+    if tf in ('1d', '1w', '1mo'):
+        return tf, None
+    match = _INTRADAY.match(tf)
+    if match and tf != '1m':  # '1m' is ambiguous between minute and month
+        minutes = int(match.group(1)) * (60 if match.group(2) == 'h' else 1)
+        if minutes > 0:
+            return 'intraday', minutes
+    raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+
+def periods_per_year(timeframe: str) -> float:
+    """
+    Bars per year of a timeframe, used to annualize per-bar statistics
+
+    Args:
+        timeframe (str): A timeframe (see parse_timeframe) or a Yahoo Finance
+            interval ('1m', '5m', '1h', '1d', '5d', '1wk', '1mo', '3mo')
+
+    Returns:
+        float: 252 for daily, 52 weekly, 12 monthly and 252 times the session
+            buckets per day for intraday bars
+    """
+    tf = timeframe.strip().lower()
+    if tf in _PERIODS_PER_YEAR:
+        return _PERIODS_PER_YEAR[tf]
+    if tf == '1m':  # Yahoo Finance minute bars
+        tf = '1min'
+    kind, minutes = parse_timeframe(tf)
+    if minutes is None:
+        return _PERIODS_PER_YEAR[kind]
+    return TRADING_DAYS_PER_YEAR * math.ceil(SESSION_MINUTES / minutes)
+
+
+def period_start(times: pd.DatetimeIndex, timeframe: str) -> pd.DatetimeIndex:
+    """
+    Start of the calendar period each timestamp falls in: the day, the Monday
+    of the week, the first of the month, or the N-minute bucket counted from
+    the session open
+    """
+    kind, minutes = parse_timeframe(timeframe)
+    times = pd.DatetimeIndex(times)
+    day = times.normalize()
+    if kind == '1d':
+        return day
+    if kind == '1w':
+        return day - pd.to_timedelta(times.dayofweek, unit='D')
+    if kind == '1mo':
+        return day - pd.to_timedelta(times.day - 1, unit='D')
+    step = pd.Timedelta(minutes=minutes)
+    return day + SESSION_OPEN + ((times - day - SESSION_OPEN) // step) * step
+
+
+def _column_name(column) -> str:
+    # yfinance may return (field, ticker) column tuples
+    return str(column[0] if isinstance(column, tuple) else column).lower()
+
+
+def _aggregations(columns) -> Dict:
+    return {c: _AGGREGATIONS.get(_column_name(c), 'last') for c in columns}
+
+
+def _output_layout(bars: pd.DataFrame, data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Match the input's layout: 'date' column for screener frames, DatetimeIndex otherwise"""
+    if 'date' in data.columns:
+        bars = bars.reset_index()
+    bars.attrs.update(data.attrs)
+    bars.attrs['timeframe'] = timeframe
+    return bars
+
+
+def resample_bars(data: pd.DataFrame, timeframe: str, by: Optional[str] = None) -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars into a higher timeframe
+
+    Open is the first, high the max, low the min, close the last value and volume
+    the sum of the base bars in each period; other columns keep their last value.
+    Bars are labelled with their period start. With `by`, a long frame holding
+    the whole universe is resampled in one grouped pass.
+
+    Args:
+        data (pd.DataFrame): Base bars, indexed by date or with a 'date' column
+        timeframe (str): Target timeframe (see parse_timeframe)
+        by (str): Symbol column of a multi-symbol frame
+
+    Returns:
+        pd.DataFrame: Resampled bars in the same layout as data, with (by, 'date')
+            columns for multi-symbol frames
+    """
+    labels = period_start(_bar_index(data), timeframe)
+    values = data.drop(columns=[c for c in ('date', by) if c is not None and c in data.columns])
+    if by is None:
+        keys = [labels.rename('date')]
+    else:
+        keys = [data[by].to_numpy(), labels.rename('date')]
+
+    bars = values.groupby(keys, sort=True).agg(_aggregations(values.columns))
+    if by is not None:
+        bars.index = bars.index.set_names([by, 'date'])
+        bars = bars.reset_index()
+        bars.attrs['timeframe'] = timeframe
+        return bars
+    return _output_layout(bars, data, timeframe)
+
+
+def _row_hash(base: pd.DataFrame, time: pd.Timestamp) -> int:
+    """Hash of the values of the base bar at time"""
+    return int(pd.util.hash_pandas_object(base.loc[[time]], index=False).iloc[0])
+
+
+def _merge_bars(previous: pd.Series, update: pd.Series, how: Dict) -> pd.Series:
+    """Combine a stored (possibly partial) bar with newly resampled bars of the same period"""
+    merged = update.copy()
+    for column, agg in how.items():
+        if agg == 'first':
+            merged[column] = previous[column]
+        elif agg == 'max':
+            merged[column] = np.fmax(previous[column], update[column])
+        elif agg == 'min':
+            merged[column] = np.fmin(previous[column], update[column])
+        elif agg == 'sum':
+            merged[column] = previous[column] + update[column]
+    return merged
+
+
+class BarResampler:
+    _default = None
+    _default_lock = threading.Lock()
+
+    def __init__(self):
+        """
+        Cache of higher-timeframe bars keyed by (symbol, base interval, timeframe);
+        the base interval is data.attrs['interval'] when set, so daily and
+        intraday base series of a symbol never share bars
+
+        Bars are built once from the base series and extended as base bars
+        arrive: only bars after the last seen one are aggregated and, since
+        OHLCV aggregation is associative, merged into the stored last period.
+        Frames that start before the stored history or after its last bar,
+        or whose copy of the last seen base bar has different values (a bar
+        that was still forming), rebuild it.
+        """
+        # (symbol, interval, timeframe) ->
+        #     (bars indexed by period start, first base time, last base time, last base bar hash)
+        self._bars: Dict[Tuple[str, Optional[str], str],
+                         Tuple[pd.DataFrame, pd.Timestamp, pd.Timestamp, int]] = {}
+        self._lock = threading.RLock()
+        self.bars_aggregated = 0
+
+    @classmethod
+    def get_default(cls) -> 'BarResampler':
+        """Process-wide in-memory resampler"""
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def get(self, symbol: str, data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """
+        Resampled bars covering the span of data
+
+        Args:
+            symbol (str): Stock symbol
+            data (pd.DataFrame): Base bars, indexed by date or with a 'date' column
+            timeframe (str): Target timeframe (see parse_timeframe)
+
+        Returns:
+            pd.DataFrame: Bars in the same layout as data. Periods are built from
+                every base bar seen for the symbol, so the first bar may include
+                history from before data starts; the last bar only includes base
+                bars up to the end of data.
+        """
+        return self.get_many({symbol: data}, timeframe)[symbol]
+
+    def get_many(self, frames: Dict[str, pd.DataFrame], timeframe: str) -> Dict[str, pd.DataFrame]:
+        """
+        Resampled bars for several symbols; all bars that need aggregating are
+        processed in one grouped pass over the universe
+
+        Args:
+            frames (Dict[str, pd.DataFrame]): Base bars per symbol
+            timeframe (str): Target timeframe (see parse_timeframe)
+
+        Returns:
+            Dict[str, pd.DataFrame]: Resampled bars per symbol
+        """
+        parse_timeframe(timeframe)
+        keys = {symbol: (symbol, data.attrs.get('interval'), timeframe)
+                for symbol, data in frames.items()}
+        pending: Dict[str, pd.DataFrame] = {}
+        spans: Dict[str, Tuple[pd.Timestamp, pd.Timestamp, int]] = {}
+        with self._lock:
+            for symbol, data in frames.items():
+                if len(data) == 0:
+                    continue
+                base = data.set_axis(_bar_index(data), axis=0)
+                if not base.index.is_monotonic_increasing:
+                    base = base.sort_index()
+                if base.index.has_duplicates:
+                    base = base[~base.index.duplicated(keep='last')]
+
+                stored = self._bars.get(keys[symbol])
+                if stored is not None and stored[2] in base.index and \
+                        _row_hash(base, stored[2]) != stored[3]:
+                    # The last seen base bar was revised: its period can not be merged into
+                    stored = None
+                if stored is None or base.index[0] < stored[1] or base.index[0] > stored[2]:
+                    # No cache, or data that does not overlap it: rebuild so periods have no gaps
+                    self._bars.pop(keys[symbol], None)
+                elif base.index[-1] > stored[2]:
+                    base = base.iloc[base.index.searchsorted(stored[2], side='right'):]
+                else:
+                    continue
+                pending[symbol] = base
+                spans[symbol] = (base.index[0], base.index[-1], _row_hash(base, base.index[-1]))
+
+            if pending:
+                universe = pd.concat(pending, names=['_symbol', 'date'])
+                universe = universe.drop(columns='date', errors='ignore').reset_index()
+                self.bars_aggregated += len(universe)
+                resampled = resample_bars(universe, timeframe, by='_symbol')
+                for symbol, new in resampled.groupby('_symbol', sort=False):
+                    self._extend(keys[symbol], new.drop(columns='_symbol').set_index('date'),
+                                 *spans[symbol])
+
+            results = {}
+            for symbol, data in frames.items():
+                stored = self._bars.get(keys[symbol])
+                if stored is None or len(data) == 0:
+                    results[symbol] = resample_bars(data, timeframe)
+                    continue
+                times = _bar_index(data)
+                span = period_start(pd.DatetimeIndex([times.min(), times.max()]), timeframe)
+                bars = stored[0].loc[span[0]:span[1]].copy()
+                if times.max() < stored[2]:
+                    # The stored last period also holds base bars after data ends: rebuild it from data
+                    tail = data.set_axis(times, axis=0)[times >= span[1]]
+                    tail = resample_bars(tail.drop(columns='date', errors='ignore'), timeframe)
+                    bars = pd.concat([bars[bars.index < span[1]], tail.astype(bars.dtypes)])
+                    bars = bars.rename_axis('date')
+                results[symbol] = _output_layout(bars, data, timeframe)
+        return results
+
+    def _extend(self, key: tuple, new: pd.DataFrame, first: pd.Timestamp, last: pd.Timestamp,
+                last_hash: int):
+        stored = self._bars.get(key)
+        if stored is None:
+            self._bars[key] = (new, first, last, last_hash)
+            return
+        bars = stored[0]
+        if new.index[0] == bars.index[-1]:
+            merged = _merge_bars(bars.iloc[-1], new.iloc[0], _aggregations(new.columns))
+            new = pd.concat([merged.to_frame().T.astype(new.dtypes), new.iloc[1:]])
+            bars = bars.iloc[:-1]
+        bars = pd.concat([bars, new]).rename_axis('date')
+        self._bars[key] = (bars, stored[1], last, last_hash)
+
+    def invalidate(self, symbol: Optional[str] = None):
+        """Drop cached bars for a symbol, or everything if no symbol is given"""
+        with self._lock:
+            for key in [k for k in self._bars if symbol is None or k[0] == symbol]:
+                del self._bars[key]
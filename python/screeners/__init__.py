@@ -10,6 +10,7 @@ The package includes the following key modules:
 - technical_screener: Implementations of common technical analysis screeners
 - advanced_screener: Advanced screening algorithms with multiple indicator combinations
 - run_screeners: Utility to run multiple screeners and consolidate results
+- results_store: Indexed SQLite history of screener runs for querying past matches
 
 Features:
 - Multiple pre-built screeners (momentum, trend following, breakout, etc.)
@@ -27,5 +28,6 @@ from .base_screener import BaseScreener
 from .technical_screener import TechnicalScreener
 from .advanced_screener import AdvancedScreener
 from .run_screeners import run_all_screeners
+from .results_store import ScreenerResultsStore
 
-__all__ = ['BaseScreener', 'TechnicalScreener', 'AdvancedScreener', 'run_all_screeners']
+__all__ = ['BaseScreener', 'TechnicalScreener', 'AdvancedScreener', 'run_all_screeners', 'ScreenerResultsStore']
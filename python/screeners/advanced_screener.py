@@ -1,10 +1,13 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 from .base_screener import BaseScreener
+from ..features.feature_store import FeatureStore
+from ..features.resampler import BarResampler, parse_timeframe
 
 class AdvancedScreener(BaseScreener):
-    def __init__(self, db_params: Dict[str, Any]):
-        super().__init__(db_params)
+    def __init__(self, db_params: Dict[str, Any], feature_store: Optional[FeatureStore] = None,
+                 compact: bool = False, resampler: Optional[BarResampler] = None):
+        super().__init__(db_params, feature_store, compact, resampler)
     
     def volume_breakout_screener(self, volume_multiplier: float = 2.0, price_change_min: float = 2.0) -> List[Dict[str, Any]]:
         """
@@ -27,7 +30,9 @@ class AdvancedScreener(BaseScreener):
             if len(df) < 30:
                 continue
                 
-            df = self.calculate_technical_indicators(df)
+            df = self.calculate_technical_indicators(
+                df, columns=['close', 'volume', 'volume_ratio', 'price_change']
+            )
             latest = df.iloc[-1]
             
             if (latest['volume_ratio'] > volume_multiplier and 
@@ -59,7 +64,7 @@ class AdvancedScreener(BaseScreener):
             if len(df) < lookback_period * 2:
                 continue
                 
-            df = self.calculate_technical_indicators(df)
+            df = self.calculate_technical_indicators(df, columns=['close', 'rsi'])
             
             # Check for bullish divergence
             price_low = df['close'].rolling(window=lookback_period).min()
@@ -76,10 +81,22 @@ class AdvancedScreener(BaseScreener):
         
         return results
     
-    def multi_timeframe_trend_screener(self) -> List[Dict[str, Any]]:
+    def multi_timeframe_trend_screener(self, timeframes: Optional[List[str]] = None,
+                                       fast_period: int = 10,
+                                       slow_period: int = 20) -> List[Dict[str, Any]]:
         """
         Screen for stocks showing strong trends across multiple timeframes
+        
+        Args:
+            timeframes: Bar timeframes that must all be trending, e.g. ['1d', '1w', '1mo'].
+                Each is resampled from one daily fetch. If omitted, daily EMA
+                10 > 20 > 50 > 200 stands in for short, medium and long term.
+            fast_period: Fast EMA period used with timeframes
+            slow_period: Slow EMA period used with timeframes
         """
+        if timeframes:
+            return self._resampled_trend_screener(timeframes, fast_period, slow_period)
+        
         results = []
         symbols = self.get_all_symbols()
         
@@ -93,7 +110,9 @@ class AdvancedScreener(BaseScreener):
             if len(df) < 200:
                 continue
                 
-            df = self.calculate_technical_indicators(df)
+            df = self.calculate_technical_indicators(
+                df, columns=['close', 'ema_10', 'ema_20', 'ema_50', 'ema_200']
+            )
             latest = df.iloc[-1]
             
             # Check trends across multiple timeframes
@@ -113,6 +132,44 @@ class AdvancedScreener(BaseScreener):
         
         return results
     
+    def _resampled_trend_screener(self, timeframes: List[str], fast_period: int,
+                                  slow_period: int) -> List[Dict[str, Any]]:
+        """Fast EMA above slow EMA and close above slow EMA on every timeframe"""
+        # Enough daily history for slow_period bars of the longest timeframe
+        days_per_bar = {'1d': 1.5, '1w': 7, '1mo': 31}
+        lookback_days = max(
+            days_per_bar.get(parse_timeframe(tf)[0], 1) for tf in timeframes
+        ) * slow_period * 1.5
+        
+        results = []
+        symbols = self.get_all_symbols()
+        
+        for symbol in symbols:
+            df = self.get_historical_data(
+                symbol,
+                pd.Timestamp.now() - pd.Timedelta(days=lookback_days),
+                pd.Timestamp.now()
+            )
+            
+            match = {'symbol': symbol, 'close': df['close'].iloc[-1] if len(df) else None}
+            for timeframe in timeframes:
+                bars = self.resample(df, timeframe)
+                if len(bars) < slow_period:
+                    match = None
+                    break
+                fast = self._feature(bars, 'ema', window=fast_period).iloc[-1]
+                slow = self._feature(bars, 'ema', window=slow_period).iloc[-1]
+                if not (fast > slow and bars['close'].iloc[-1] > slow):
+                    match = None
+                    break
+                match[f'ema_{fast_period}_{timeframe}'] = fast
+                match[f'ema_{slow_period}_{timeframe}'] = slow
+            
+            if match is not None:
+                results.append(match)
+        
+        return results
+    
     def volatility_breakout_screener(self, atr_multiplier: float = 2.0) -> List[Dict[str, Any]]:
         """
         Screen for stocks breaking out of their normal volatility range
@@ -130,7 +187,9 @@ class AdvancedScreener(BaseScreener):
             if len(df) < 20:
                 continue
                 
-            df = self.calculate_technical_indicators(df)
+            df = self.calculate_technical_indicators(
+                df, columns=['close', 'bb_width', 'atr', 'volume_ratio']
+            )
             latest = df.iloc[-1]
             
             # Check for volatility breakout
@@ -163,7 +222,9 @@ class AdvancedScreener(BaseScreener):
             if len(df) < 20:
                 continue
                 
-            df = self.calculate_technical_indicators(df)
+            df = self.calculate_technical_indicators(
+                df, columns=['close', 'rsi', 'stoch_k', 'stoch_d', 'macd_diff']
+            )
             latest = df.iloc[-1]
             prev = df.iloc[-2]
             
@@ -1,12 +1,18 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import ta
+from ..features.feature_store import FeatureStore, compute_feature
+from ..features.resampler import BarResampler, resample_bars
+from ..utils.compact import to_compact, MemoryTracker, OHLCV_COLUMNS
+from ..utils.instrumentation import timed
+from . import sqlite_adapter
 
 class BaseScreener:
-    def __init__(self, db_params: Dict[str, Any]):
+    def __init__(self, db_params: Dict[str, Any], feature_store: Optional[FeatureStore] = None,
+                 compact: bool = False, resampler: Optional[BarResampler] = None):
         """
         Initialize the base screener with database connection parameters
         
@@ -19,13 +25,29 @@ class BaseScreener:
                     'host': str,
                     'port': str
                 }
+                or {'sqlite_path': str} for a local SQLite copy of historical_data
+            feature_store (FeatureStore): Optional shared store for RSI and moving
+                averages. Stored values are computed over all history the store has
+                seen for the symbol, not only the bars in the current frame.
+            compact (bool): Hold prices and indicators as float32 (see
+                utils.compact.COMPACT_TOLERANCES)
+            resampler (BarResampler): Cache of higher-timeframe bars, private to the
+                screener if omitted
         """
         self.db_params = db_params
+        self.feature_store = feature_store
+        self.compact = compact
+        self.resampler = resampler or BarResampler()
+        self.memory = MemoryTracker()
+        self.indicator_calls = 0
         
     def get_connection(self):
         """Create and return a database connection"""
+        if 'sqlite_path' in self.db_params:
+            return sqlite_adapter.connect(self.db_params['sqlite_path'])
         return psycopg2.connect(**self.db_params, cursor_factory=RealDictCursor)
     
+    @timed('db_query', query='historical_data')
     def get_historical_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
         """
         Fetch historical data for a given symbol from PostgreSQL
@@ -47,24 +69,38 @@ class BaseScreener:
                 ORDER BY date
             """
             df = pd.read_sql_query(query, conn, params=(symbol, start_date, end_date))
+            df.attrs['symbol'] = symbol
+            if self.compact:
+                df = to_compact(df)
+            self.memory.record('historical_data', df)
             return df
     
-    def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    @timed('indicators')
+    def calculate_technical_indicators(self, df: pd.DataFrame,
+                                       columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Calculate comprehensive technical indicators
         
         Args:
             df (pd.DataFrame): DataFrame with OHLCV data
+            columns (List[str]): Columns to keep in compact mode, all if omitted
             
         Returns:
             pd.DataFrame: DataFrame with additional technical indicators
         """
+        self.indicator_calls += 1
+        if self.compact:
+            # Indicators are computed in float64 from the float32 inputs and only stored as float32
+            df = df.astype({c: np.float64 for c in OHLCV_COLUMNS if c in df.columns})
+        
         # Momentum Indicators
-        df['rsi'] = ta.momentum.RSIIndicator(df['close']).rsi()
+        df['rsi'] = self._feature(df, 'rsi', period=14)
         df['stoch_k'] = ta.momentum.StochasticOscillator(df['high'], df['low'], df['close']).stoch()
         df['stoch_d'] = ta.momentum.StochasticOscillator(df['high'], df['low'], df['close']).stoch_signal()
         df['cci'] = ta.trend.CCIIndicator(df['high'], df['low'], df['close']).cci()
-        df['adx'] = ta.trend.ADXIndicator(df['high'], df['low'], df['close']).adx()
+        # ta's ADX indexes past its first 2 * window bars and fails on shorter frames
+        df['adx'] = (ta.trend.ADXIndicator(df['high'], df['low'], df['close']).adx()
+                     if len(df) > 2 * 14 else np.nan)
         df['mfi'] = ta.volume.MFIIndicator(df['high'], df['low'], df['close'], df['volume']).money_flow_index()
         
         # Trend Indicators
@@ -74,17 +110,10 @@ class BaseScreener:
         df['macd_diff'] = macd.macd_diff()
         
         # Moving Averages
-        df['sma_5'] = ta.trend.SMAIndicator(df['close'], window=5).sma_indicator()
-        df['sma_10'] = ta.trend.SMAIndicator(df['close'], window=10).sma_indicator()
-        df['sma_20'] = ta.trend.SMAIndicator(df['close'], window=20).sma_indicator()
-        df['sma_50'] = ta.trend.SMAIndicator(df['close'], window=50).sma_indicator()
-        df['sma_200'] = ta.trend.SMAIndicator(df['close'], window=200).sma_indicator()
-        
-        df['ema_5'] = ta.trend.EMAIndicator(df['close'], window=5).ema_indicator()
-        df['ema_10'] = ta.trend.EMAIndicator(df['close'], window=10).ema_indicator()
-        df['ema_20'] = ta.trend.EMAIndicator(df['close'], window=20).ema_indicator()
-        df['ema_50'] = ta.trend.EMAIndicator(df['close'], window=50).ema_indicator()
-        df['ema_200'] = ta.trend.EMAIndicator(df['close'], window=200).ema_indicator()
+        for window in (5, 10, 20, 50, 200):
+            df[f'sma_{window}'] = self._feature(df, 'sma', window=window)
+        for window in (5, 10, 20, 50, 200):
+            df[f'ema_{window}'] = self._feature(df, 'ema', window=window)
         
         # Volatility Indicators
         bollinger = ta.volatility.BollingerBands(df['close'])
@@ -107,8 +136,37 @@ class BaseScreener:
         df['volume_sma_20'] = ta.trend.SMAIndicator(df['volume'], window=20).sma_indicator()
         df['volume_ratio'] = df['volume'] / df['volume_sma_20']
         
+        if self.compact:
+            df = to_compact(df, columns)
+        self.memory.record('indicators', df)
         return df
     
+    def resample(self, df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+        """
+        Bars of df aggregated to another timeframe ('1w', '1mo', '15min', ...)
+        without fetching anything; derived features of the result are kept
+        apart from the base series in the feature store
+        
+        Args:
+            df (pd.DataFrame): Historical data from get_historical_data
+            timeframe (str): Target timeframe (see features.resampler.parse_timeframe)
+            
+        Returns:
+            pd.DataFrame: Resampled OHLCV data with a 'date' column of period starts
+        """
+        symbol = df.attrs.get('symbol')
+        if symbol is None:
+            return resample_bars(df, timeframe)
+        return self.resampler.get(symbol, df, timeframe)
+    
+    def _feature(self, df: pd.DataFrame, name: str, **params) -> pd.Series:
+        """Derived feature from the shared store when configured, else computed in place"""
+        symbol = df.attrs.get('symbol')
+        if self.feature_store is None or symbol is None:
+            return compute_feature(name, df, **params)
+        return self.feature_store.get(symbol, name, df, **params)
+    
+    @timed('db_query', query='symbols')
     def get_all_symbols(self) -> List[str]:
         """Get all available stock symbols from the database"""
         with self.get_connection() as conn:
@@ -0,0 +1,183 @@
+import json
+import math
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _clean(value: Any) -> Any:
+    """JSON-safe copy of a screener result (numpy scalars to Python, NaN/inf to None)"""
+    if isinstance(value, dict):
+        return {k: _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if isinstance(value, (datetime, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+class ScreenerResultsStore:
+    def __init__(self, path: str = 'screener_results.sqlite'):
+        """
+        Indexed history of screener runs keyed by run, screener and symbol
+
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS screener_runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at TEXT NOT NULL,
+                    completed_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS screener_results (
+                    run_id INTEGER NOT NULL REFERENCES screener_runs (run_id),
+                    screener TEXT NOT NULL,
+                    symbol TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    PRIMARY KEY (run_id, screener, symbol)
+                );
+                CREATE INDEX IF NOT EXISTS idx_screener_results_screener
+                    ON screener_results (screener, run_id);
+                CREATE INDEX IF NOT EXISTS idx_screener_results_symbol
+                    ON screener_results (symbol, run_id);
+                CREATE TABLE IF NOT EXISTS screener_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO screener_meta VALUES ('generation', 0);
+            """)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection per operation so the store is safe across threads and processes"""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def start_run(self) -> int:
+        """Register a new run and return its id"""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO screener_runs (started_at) VALUES (?)",
+                (datetime.now().isoformat(timespec='seconds'),)
+            )
+            return cur.lastrowid
+
+    def add_results(self, run_id: int, screener: str, results: List[Dict[str, Any]]):
+        """Store one screener's matches for a run"""
+        rows = [
+            (run_id, screener, str(result['symbol']), json.dumps(_clean(result)))
+            for result in results
+        ]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO screener_results VALUES (?, ?, ?, ?)", rows
+            )
+
+    def complete_run(self, run_id: int):
+        """Mark a run complete, making it visible to queries and invalidating caches"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE screener_runs SET completed_at = ? WHERE run_id = ?",
+                (datetime.now().isoformat(timespec='seconds'), run_id)
+            )
+            conn.execute("UPDATE screener_meta SET value = value + 1 WHERE key = 'generation'")
+
+    def generation(self) -> int:
+        """Counter bumped by every completed run; cached query results are valid while it is unchanged"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT value FROM screener_meta WHERE key = 'generation'"
+            ).fetchone()[0]
+
+    @staticmethod
+    def _page(rows, total: int, limit: int, offset: int, **extra) -> Dict[str, Any]:
+        items = []
+        for row in rows:
+            item = json.loads(row['payload'])
+            item.update({k: row[k] for k in row.keys() if k != 'payload'})
+            items.append(item)
+        return {'items': items, 'total': total, 'limit': limit, 'offset': offset, **extra}
+
+    def runs(self, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """Completed runs, newest first, with match counts per screener"""
+        with self._connect() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM screener_runs WHERE completed_at IS NOT NULL"
+            ).fetchone()[0]
+            runs = conn.execute("""
+                SELECT run_id, started_at, completed_at FROM screener_runs
+                WHERE completed_at IS NOT NULL
+                ORDER BY run_id DESC LIMIT ? OFFSET ?
+            """, (limit, offset)).fetchall()
+            items = []
+            for run in runs:
+                counts = conn.execute("""
+                    SELECT screener, COUNT(*) AS matches FROM screener_results
+                    WHERE run_id = ? GROUP BY screener
+                """, (run['run_id'],)).fetchall()
+                items.append({**dict(run), 'matches': {r['screener']: r['matches'] for r in counts}})
+        return {'items': items, 'total': total, 'limit': limit, 'offset': offset}
+
+    def latest_run_id(self) -> Optional[int]:
+        """Most recent completed run"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(run_id) FROM screener_runs WHERE completed_at IS NOT NULL"
+            ).fetchone()
+        return row[0]
+
+    def latest_matches(self, screener: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """
+        Matches of a screener in the most recent completed run, ordered by symbol;
+        empty if that run found none, even when an older run did
+        """
+        run_id = self.latest_run_id()
+        with self._connect() as conn:
+            total = conn.execute(
+                "SELECT COUNT(*) FROM screener_results WHERE screener = ? AND run_id = ?",
+                (screener, run_id)
+            ).fetchone()[0]
+            rows = conn.execute("""
+                SELECT symbol, payload FROM screener_results
+                WHERE screener = ? AND run_id = ?
+                ORDER BY symbol LIMIT ? OFFSET ?
+            """, (screener, run_id, limit, offset)).fetchall()
+        return self._page(rows, total, limit, offset, screener=screener, run_id=run_id)
+
+    def symbol_history(self, symbol: str, screener: Optional[str] = None,
+                       limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+        """Every completed-run match of a symbol across screeners, newest first"""
+        where = "r.symbol = ? AND s.completed_at IS NOT NULL"
+        params: list = [symbol]
+        if screener is not None:
+            where += " AND r.screener = ?"
+            params.append(screener)
+        with self._connect() as conn:
+            total = conn.execute(f"""
+                SELECT COUNT(*) FROM screener_results r
+                JOIN screener_runs s ON s.run_id = r.run_id WHERE {where}
+            """, params).fetchone()[0]
+            rows = conn.execute(f"""
+                SELECT r.run_id, s.completed_at, r.screener, r.payload
+                FROM screener_results r JOIN screener_runs s ON s.run_id = r.run_id
+                WHERE {where}
+                ORDER BY r.run_id DESC, r.screener LIMIT ? OFFSET ?
+            """, params + [limit, offset]).fetchall()
+        return self._page(rows, total, limit, offset, symbol=symbol)
@@ -1,39 +1,76 @@
-from technical_screener import TechnicalScreener
-from advanced_screener import AdvancedScreener
+from .technical_screener import TechnicalScreener
+from .advanced_screener import AdvancedScreener
+from .results_store import ScreenerResultsStore
+from ..features.feature_store import FeatureStore
+from ..utils import instrumentation
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 from datetime import datetime
 
-def run_all_screeners(db_params: Dict[str, Any]):
-    """Run all available screeners and save results"""
+def run_all_screeners(db_params: Dict[str, Any], compact: bool = False,
+                      results_store: Optional[ScreenerResultsStore] = None,
+                      save_csv: bool = True, verbose: bool = True,
+                      shared_features: bool = False):
+    """
+    Run all available screeners and save results
+    
+    Args:
+        db_params (Dict[str, Any]): Database connection parameters
+        compact (bool): Use float32 frames for lower memory use
+        results_store (ScreenerResultsStore): Also record the run in this history store
+        save_csv (bool): Write one CSV per screener to the working directory
+        verbose (bool): Print progress, result tables and memory usage
+        shared_features (bool): Serve RSI and moving averages to every screener from
+            FeatureStore.get_default(), so each is computed once per symbol and bar.
+            Stored values cover all history the process has seen for a symbol, so
+            the first bars of a short window can differ from a fresh computation.
+    """
     
     # Initialize screeners
-    tech_screener = TechnicalScreener(db_params)
-    adv_screener = AdvancedScreener(db_params)
+    feature_store = FeatureStore.get_default() if shared_features else None
+    tech_screener = TechnicalScreener(db_params, feature_store, compact=compact)
+    adv_screener = AdvancedScreener(db_params, feature_store, compact=compact)
     
     # Dictionary to store all screening results
     all_results = {}
     
-    # Run Technical Screeners
-    print("Running Technical Screeners...")
-    all_results['momentum'] = tech_screener.momentum_screener(min_rsi=55, min_volume=150000)
-    all_results['breakout'] = tech_screener.breakout_screener(volume_ratio=2.0)
-    all_results['trend_following'] = tech_screener.trend_following_screener(trend_period=50)
+    screener_groups = {
+        'Technical': {
+            'momentum': lambda: tech_screener.momentum_screener(min_rsi=55, min_volume=150000),
+            'breakout': lambda: tech_screener.breakout_screener(volume_ratio=2.0),
+            'trend_following': lambda: tech_screener.trend_following_screener(trend_period=50)
+        },
+        'Advanced': {
+            'volume_breakout': lambda: adv_screener.volume_breakout_screener(
+                volume_multiplier=2.0,
+                price_change_min=2.0
+            ),
+            'rsi_divergence': lambda: adv_screener.rsi_divergence_screener(lookback_period=14),
+            'multi_timeframe_trend': lambda: adv_screener.multi_timeframe_trend_screener(),
+            'volatility_breakout': lambda: adv_screener.volatility_breakout_screener(atr_multiplier=2.0),
+            'momentum_reversal': lambda: adv_screener.momentum_reversal_screener(
+                oversold_rsi=30,
+                overbought_rsi=70
+            )
+        }
+    }
+    
+    run_id = results_store.start_run() if results_store is not None else None
     
-    # Run Advanced Screeners
-    print("Running Advanced Screeners...")
-    all_results['volume_breakout'] = adv_screener.volume_breakout_screener(
-        volume_multiplier=2.0,
-        price_change_min=2.0
-    )
-    all_results['rsi_divergence'] = adv_screener.rsi_divergence_screener(lookback_period=14)
-    all_results['multi_timeframe_trend'] = adv_screener.multi_timeframe_trend_screener()
-    all_results['volatility_breakout'] = adv_screener.volatility_breakout_screener(atr_multiplier=2.0)
-    all_results['momentum_reversal'] = adv_screener.momentum_reversal_screener(
-        oversold_rsi=30,
-        overbought_rsi=70
-    )
+    # Run Technical and Advanced Screeners
+    for group, screeners in screener_groups.items():
+        if verbose:
+            print(f"Running {group} Screeners...")
+        for screener_name, screener in screeners.items():
+            with instrumentation.timer('screener', screener=screener_name):
+                all_results[screener_name] = screener()
+            if run_id is not None:
+                results_store.add_results(run_id, screener_name, all_results[screener_name])
+    
+    # The run only becomes visible to queries once every screener has finished
+    if run_id is not None:
+        results_store.complete_run(run_id)
     
     # Process and save results
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -42,16 +79,25 @@ def run_all_screeners(db_params: Dict[str, Any]):
     for screener_name, results in all_results.items():
         if results:
             df = pd.DataFrame(results)
-            print(f"\nResults for {screener_name} screener:")
-            print(df)
+            if verbose:
+                print(f"\nResults for {screener_name} screener:")
+                print(df)
             
             # Save to CSV
-            output_file = f"screener_results_{screener_name}_{timestamp}.csv"
-            df.to_csv(output_file, index=False)
-            print(f"Results saved to {output_file}")
-        else:
+            if save_csv:
+                output_file = f"screener_results_{screener_name}_{timestamp}.csv"
+                df.to_csv(output_file, index=False)
+                if verbose:
+                    print(f"Results saved to {output_file}")
+        elif verbose:
             print(f"\nNo results found for {screener_name} screener")
     
+    # Report frame memory per stage
+    if verbose:
+        for name, screener in (('technical', tech_screener), ('advanced', adv_screener)):
+            print(f"\nMemory usage ({name} screeners):")
+            print(screener.memory.summary())
+    
     return all_results
 
 if __name__ == "__main__":
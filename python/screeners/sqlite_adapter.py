@@ -0,0 +1,43 @@
+import sqlite3
+from datetime import date, datetime
+from typing import Any, Iterable
+
+
+def _adapt(value: Any) -> Any:
+    """Bind dates as ISO text so they compare correctly with stored dates"""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+class SQLiteCursor(sqlite3.Cursor):
+    """Cursor accepting psycopg2-style %s placeholders, usable as a context manager"""
+
+    def execute(self, query: str, params: Iterable[Any] = ()):
+        return super().execute(query.replace('%s', '?'), [_adapt(p) for p in params or ()])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SQLiteConnection(sqlite3.Connection):
+    """
+    psycopg2-compatible SQLite connection (dict-style rows, %s placeholders), so
+    screeners can run against a local copy of the historical_data table
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.row_factory = sqlite3.Row
+
+    def cursor(self, factory=SQLiteCursor):
+        return super().cursor(factory)
+
+
+def connect(path: str) -> SQLiteConnection:
+    return sqlite3.connect(path, factory=SQLiteConnection)
@@ -1,10 +1,13 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
 from .base_screener import BaseScreener
+from ..features.feature_store import FeatureStore
+from ..features.resampler import BarResampler
 
 class TechnicalScreener(BaseScreener):
-    def __init__(self, db_params: Dict[str, Any]):
-        super().__init__(db_params)
+    def __init__(self, db_params: Dict[str, Any], feature_store: Optional[FeatureStore] = None,
+                 compact: bool = False, resampler: Optional[BarResampler] = None):
+        super().__init__(db_params, feature_store, compact, resampler)
     
     def momentum_screener(self, min_rsi: float = 50, min_volume: int = 100000) -> List[Dict[str, Any]]:
         """
@@ -31,7 +34,9 @@ class TechnicalScreener(BaseScreener):
             if len(df) < 50:
                 continue
                 
-            df = self.calculate_technical_indicators(df)
+            df = self.calculate_technical_indicators(
+                df, columns=['close', 'volume', 'rsi', 'sma_20', 'sma_50', 'macd']
+            )
             latest = df.iloc[-1]
             
             # Check momentum criteria
@@ -72,7 +77,7 @@ class TechnicalScreener(BaseScreener):
             if len(df) < 20:
                 continue
                 
-            df = self.calculate_technical_indicators(df)
+            df = self.calculate_technical_indicators(df, columns=['close', 'volume', 'bb_high'])
             latest = df.iloc[-1]
             
             # Calculate volume conditions
@@ -116,7 +121,9 @@ class TechnicalScreener(BaseScreener):
             if len(df) < trend_period:
                 continue
                 
-            df = self.calculate_technical_indicators(df)
+            df = self.calculate_technical_indicators(
+                df, columns=['close', 'sma_20', 'sma_50', 'sma_200']
+            )
             latest = df.iloc[-1]
             
             # Check for strong uptrend conditions
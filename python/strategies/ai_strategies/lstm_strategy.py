@@ -5,31 +5,40 @@ from tensorflow.keras.layers import LSTM, Dense, Dropout
 from tensorflow.keras.optimizers import Adam
 from sklearn.preprocessing import MinMaxScaler
 from ..base_strategy import BaseStrategy
+from ...utils.compact import to_compact
+from ...utils import instrumentation
+
+FEATURES = ['close', 'volume', 'returns', 'volatility', 'rsi']
 
 class LSTMStrategy(BaseStrategy):
-    def __init__(self, parameters: dict = None):
+    def __init__(self, parameters: dict = None, feature_store=None):
         default_params = {
             'sequence_length': 60,
             'lstm_units': 50,
             'epochs': 50,
             'batch_size': 32,
-            'prediction_threshold': 0.55
+            'prediction_threshold': 0.55,
+            'compact': False  # float32 features, int8 signals, 'close' column only
         }
-        super().__init__(parameters or default_params)
+        super().__init__({**default_params, **(parameters or {})}, feature_store)
         self.model = None
         self.scaler = MinMaxScaler()
         
-    def _prepare_data(self, data: pd.DataFrame) -> tuple:
-        """Prepare data for LSTM model"""
-        # Create features
-        df = data.copy()
-        df['returns'] = df['close'].pct_change()
-        df['volatility'] = df['returns'].rolling(20).std()
-        df['rsi'] = self._calculate_rsi(df['close'])
-        
+    def _feature_frame(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Model input columns, built without copying the whole input frame"""
+        df = pd.DataFrame({
+            'close': data['close'],
+            'volume': data['volume'],
+            'returns': self._feature(data, 'returns'),
+            'volatility': self._feature(data, 'volatility', window=20),
+            'rsi': self._feature(data, 'rsi', period=14, method='sma')
+        }, index=data.index)
+        return to_compact(df) if self.parameters.get('compact', False) else df
+    
+    def _prepare_data(self, df: pd.DataFrame) -> tuple:
+        """Training sequences, labels and the scaled features of a _feature_frame"""
         # Scale features
-        features = ['close', 'volume', 'returns', 'volatility', 'rsi']
-        scaled_data = self.scaler.fit_transform(df[features])
+        scaled_data = self.scaler.fit_transform(df[FEATURES])
         
         # Create sequences
         X, y = [], []
@@ -38,7 +47,7 @@ class LSTMStrategy(BaseStrategy):
             y.append(1 if df['close'].iloc[i + self.parameters['sequence_length']] > 
                     df['close'].iloc[i + self.parameters['sequence_length'] - 1] else 0)
         
-        return np.array(X), np.array(y)
+        return np.array(X), np.array(y), scaled_data
     
     def _build_model(self, input_shape):
         """Build LSTM model"""
@@ -54,42 +63,35 @@ class LSTMStrategy(BaseStrategy):
                      metrics=['accuracy'])
         return model
     
-    def _calculate_rsi(self, prices, period=14):
-        """Calculate RSI indicator"""
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-        rs = gain / loss
-        return 100 - (100 / (1 + rs))
-    
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate trading signals using LSTM predictions"""
-        df = data.copy()
+        compact = self.parameters.get('compact', False)
+        sequence_length = self.parameters['sequence_length']
         
         # Prepare training data
-        X, y = self._prepare_data(df)
+        X, y, scaled = self._prepare_data(self._feature_frame(data))
         
         # Build and train model if not exists
         if self.model is None:
             self.model = self._build_model(X.shape[1:])
-            self.model.fit(X, y, epochs=self.parameters['epochs'], 
-                         batch_size=self.parameters['batch_size'], verbose=0)
+            with instrumentation.timer('lstm_train'):
+                self.model.fit(X, y, epochs=self.parameters['epochs'], 
+                             batch_size=self.parameters['batch_size'], verbose=0)
         
-        # Generate predictions
-        df['signal'] = 0
-        for i in range(self.parameters['sequence_length'], len(df)):
-            sequence = df.iloc[i-self.parameters['sequence_length']:i]
-            features = ['close', 'volume', 'returns', 'volatility', 'rsi']
-            scaled_sequence = self.scaler.transform(sequence[features])
-            prediction = self.model.predict(
-                scaled_sequence.reshape(1, self.parameters['sequence_length'], -1),
-                verbose=0
-            )[0][0]
+        # Predict every window in one batched call (window i covers rows i-sequence_length..i-1)
+        signal = np.zeros(len(data), dtype=np.int8 if compact else np.int64)
+        if len(data) > sequence_length:
+            windows = np.lib.stride_tricks.sliding_window_view(
+                scaled, sequence_length, axis=0
+            )[:-1].transpose(0, 2, 1)
+            with instrumentation.timer('lstm_predict'):
+                predictions = self.model.predict(
+                    windows, batch_size=self.parameters['batch_size'], verbose=0
+                )[:, 0]
             
             # Generate signals based on prediction probability
-            if prediction > self.parameters['prediction_threshold']:
-                df.iloc[i, df.columns.get_loc('signal')] = 1
-            elif prediction < (1 - self.parameters['prediction_threshold']):
-                df.iloc[i, df.columns.get_loc('signal')] = -1
+            threshold = self.parameters['prediction_threshold']
+            signal[sequence_length:][predictions > threshold] = 1
+            signal[sequence_length:][predictions < (1 - threshold)] = -1
         
-        return df
+        return self._signal_frame(data, signal, compact)
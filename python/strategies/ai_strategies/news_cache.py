@@ -0,0 +1,306 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from ...utils import instrumentation
+
+
+def _article_id(article: Dict[str, Any]) -> str:
+    """Stable id for a NewsAPI article (the API does not return one)"""
+    key = article.get('url') or f"{article.get('title')}|{article.get('publishedAt')}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def _to_utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert('UTC').tz_localize(None)
+    return ts
+
+
+def _to_day(value) -> pd.Timestamp:
+    return _to_utc(value).normalize()
+
+
+class RateLimiter:
+    def __init__(self, calls_per_second: float):
+        """
+        Minimal thread-safe limiter spacing calls at least 1 / calls_per_second apart
+
+        Args:
+            calls_per_second (float): Maximum sustained call rate, <= 0 disables limiting
+        """
+        self.interval = 1.0 / calls_per_second if calls_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class NewsCache:
+    # Bumped when the layout changes; older caches are dropped and refetched
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Local article cache keyed by (symbol, article id) with publish time index
+
+        Args:
+            path (str): SQLite database file, ':memory:' for a per-process cache
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                # Version 0 stored publish days only, which cannot order articles within a day
+                self._conn.execute("DROP TABLE IF EXISTS news_articles")
+                self._conn.execute("DROP TABLE IF EXISTS news_fetched_days")
+                self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS news_articles (
+                    symbol TEXT NOT NULL,
+                    article_id TEXT NOT NULL,
+                    published_at TEXT NOT NULL,  -- UTC, ISO 8601
+                    title TEXT,
+                    payload TEXT,
+                    PRIMARY KEY (symbol, article_id)
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_news_articles_published
+                ON news_articles (symbol, published_at)
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS news_fetched_days (
+                    symbol TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    PRIMARY KEY (symbol, day)
+                )
+            """)
+
+    def store(self, symbol: str, articles: List[Dict[str, Any]], days: List[pd.Timestamp]):
+        """Insert articles (duplicates are ignored) and mark days as fetched"""
+        rows = [
+            (symbol, _article_id(a), _to_utc(a['publishedAt']).strftime('%Y-%m-%dT%H:%M:%S'),
+             a.get('title'), json.dumps(a))
+            for a in articles if a.get('publishedAt')
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO news_articles VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO news_fetched_days VALUES (?, ?)",
+                [(symbol, d.strftime('%Y-%m-%d')) for d in days]
+            )
+
+    def fetched_days(self, symbol: str, start, end) -> set:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT day FROM news_fetched_days WHERE symbol = ? AND day BETWEEN ? AND ?",
+                (symbol, _to_day(start).strftime('%Y-%m-%d'), _to_day(end).strftime('%Y-%m-%d'))
+            ).fetchall()
+        return {pd.Timestamp(r[0]) for r in rows}
+
+    def articles(self, symbol: str, start, end) -> List[Dict[str, Any]]:
+        """Cached articles published between start and end (inclusive days), newest first"""
+        with self._lock:
+            rows = self._conn.execute("""
+                SELECT payload FROM news_articles
+                WHERE symbol = ? AND published_at >= ? AND published_at < ?
+                ORDER BY published_at DESC, article_id
+            """, (symbol, _to_day(start).strftime('%Y-%m-%d'),
+                  (_to_day(end) + pd.Timedelta(days=1)).strftime('%Y-%m-%d'))).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def close(self):
+        self._conn.close()
+
+
+class FileNewsClient:
+    def __init__(self, data_dir: str):
+        """
+        Offline stand-in for NewsApiClient serving articles from JSON files
+
+        Each symbol is read from ``<data_dir>/<symbol>.json`` which holds either a
+        list of NewsAPI article dicts or a ``{"articles": [...]}`` response.
+
+        Args:
+            data_dir (str): Directory containing per-symbol article files
+        """
+        self.data_dir = data_dir
+        self._articles: Dict[str, List[Dict[str, Any]]] = {}
+
+    def _load(self, symbol: str) -> List[Dict[str, Any]]:
+        if symbol not in self._articles:
+            path = os.path.join(self.data_dir, f"{symbol}.json")
+            articles = []
+            if os.path.exists(path):
+                with open(path) as f:
+                    payload = json.load(f)
+                articles = payload['articles'] if isinstance(payload, dict) else payload
+            self._articles[symbol] = articles
+        return self._articles[symbol]
+
+    def get_everything(self, q: str, from_param=None, to=None, page: int = 1,
+                       page_size: int = 100, **kwargs) -> Dict[str, Any]:
+        """Mirror of NewsApiClient.get_everything filtered by publish day"""
+        start = _to_day(from_param) if from_param is not None else None
+        end = _to_day(to) if to is not None else None
+        matches = [
+            a for a in self._load(q)
+            if (start is None or _to_day(a['publishedAt']) >= start)
+            and (end is None or _to_day(a['publishedAt']) <= end)
+        ]
+        offset = (page - 1) * page_size
+        return {
+            'status': 'ok',
+            'totalResults': len(matches),
+            'articles': matches[offset:offset + page_size]
+        }
+
+
+class NewsRepository:
+    def __init__(self,
+                 client,
+                 cache: Optional[NewsCache] = None,
+                 chunk_days: int = 7,
+                 max_workers: int = 4,
+                 calls_per_second: float = 1.0,
+                 page_size: int = 100,
+                 max_pages: int = 1,
+                 max_day_results: int = 100):
+        """
+        Fetch-once news access: missing date ranges are fetched concurrently
+        under a rate limit and every later lookup is answered from the cache
+
+        Args:
+            client: NewsApiClient or FileNewsClient
+            cache (NewsCache): Article cache, in-memory if omitted
+            chunk_days (int): Days covered by a single remote request
+            max_workers (int): Concurrent remote requests
+            calls_per_second (float): Rate limit shared by all workers
+            page_size (int): Articles requested per page
+            max_pages (int): Pages fetched per chunk
+            max_day_results (int): Articles kept for a single day with more results, the
+                most relevant first (NewsAPI developer plans stop at 100 results)
+        """
+        self.client = client
+        self.cache = cache or NewsCache()
+        self.chunk_days = chunk_days
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.max_day_results = max_day_results
+        self.rate_limiter = RateLimiter(calls_per_second)
+        self.remote_calls = 0
+
+    def _missing_ranges(self, symbol: str, start: pd.Timestamp,
+                        end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        fetched = self.cache.fetched_days(symbol, start, end)
+        missing = [d for d in pd.date_range(start, end, freq='D') if d not in fetched]
+
+        ranges = []
+        for day in missing:
+            if ranges and day - ranges[-1][1] == pd.Timedelta(days=1) and \
+                    (day - ranges[-1][0]).days < self.chunk_days:
+                ranges[-1] = (ranges[-1][0], day)
+            else:
+                ranges.append((day, day))
+        return ranges
+
+    def _fetch_pages(self, symbol: str, start: pd.Timestamp, end: pd.Timestamp,
+                     max_pages: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """Page through one request; returns the articles and whether every result was read"""
+        articles = []
+        page = 0
+        while page < max_pages:
+            page += 1
+            self.rate_limiter.wait()
+            self.remote_calls += 1
+            instrumentation.increment('news_api_calls')
+            with instrumentation.timer('news_fetch'):
+                response = self.client.get_everything(
+                    q=symbol,
+                    from_param=start.strftime('%Y-%m-%d'),
+                    to=end.strftime('%Y-%m-%d'),
+                    language='en',
+                    sort_by='relevancy',
+                    page=page,
+                    page_size=self.page_size
+                )
+            batch = response.get('articles', [])
+            articles.extend(batch)
+            if len(batch) < self.page_size or \
+                    len(articles) >= response.get('totalResults', 0):
+                return articles, True
+        return articles, False
+
+    def _fetch_range(self, symbol: str, start: pd.Timestamp,
+                     end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp, List[Dict[str, Any]]]]:
+        """
+        Fetch [start, end] as (start, end, articles) segments that are complete
+
+        A range with more results than max_pages returns is split in half and
+        each half fetched again, so a truncated multi-day response never gets
+        its days marked as fetched. A single day keeps its max_day_results most
+        relevant articles. A failed request drops only its own range.
+        """
+        single_day = start == end
+        max_pages = -(-self.max_day_results // self.page_size) if single_day else self.max_pages
+        try:
+            articles, complete = self._fetch_pages(symbol, start, end, max_pages)
+        except Exception as e:
+            print(f"Error fetching news for {symbol} {start.date()}..{end.date()}: {e}")
+            return []
+        if complete or single_day:
+            return [(start, end, articles[:self.max_day_results] if single_day else articles)]
+        middle = start + pd.Timedelta(days=(end - start).days // 2)
+        return self._fetch_range(symbol, start, middle) + \
+            self._fetch_range(symbol, middle + pd.Timedelta(days=1), end)
+
+    def prefetch(self, symbol: str, start, end):
+        """Fetch and cache every day in [start, end] that is not cached yet"""
+        start, end = _to_day(start), _to_day(end)
+        ranges = self._missing_ranges(symbol, start, end)
+        if not ranges:
+            return
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch_range, symbol, s, e): (s, e)
+                for s, e in ranges
+            }
+            # Today is still accumulating articles so it is never marked as fetched
+            today = pd.Timestamp.now('UTC').tz_localize(None).normalize()
+            for future, (s, e) in futures.items():
+                try:
+                    segments = future.result()
+                except Exception as e_:
+                    print(f"Error fetching news for {symbol} {s.date()}..{e.date()}: {e_}")
+                    continue
+                for seg_start, seg_end, articles in segments:
+                    days = [d for d in pd.date_range(seg_start, seg_end, freq='D') if d < today]
+                    self.cache.store(symbol, articles, days)
+
+    def get_articles(self, symbol: str, start, end) -> List[Dict[str, Any]]:
+        """Articles for [start, end], fetching only the uncached part of the range"""
+        self.prefetch(symbol, start, end)
+        return self.cache.articles(symbol, start, end)
@@ -0,0 +1,196 @@
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from ...utils import instrumentation
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class SentimentService:
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self,
+                 model: Optional[str] = None,
+                 max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0,
+                 num_threads: Optional[int] = None,
+                 quantize: bool = False,
+                 onnx: bool = False,
+                 cache_size: int = 100000):
+        """
+        Process-wide headline sentiment scorer
+
+        The model is loaded once; headlines from concurrent callers are
+        micro-batched into single forward passes and scores are cached by
+        headline text hash.
+
+        Args:
+            model (str): Hugging Face model id, pipeline default if omitted
+            max_batch_size (int): Maximum headlines per forward pass
+            max_wait_ms (float): Time to wait for a batch to fill up
+            num_threads (int): Intra-op CPU threads for torch
+            quantize (bool): Apply dynamic int8 quantization to Linear layers (CPU)
+            onnx (bool): Run an ONNX Runtime export of the model (requires optimum)
+            cache_size (int): Maximum cached headline scores
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.num_threads = num_threads
+        self.quantize = quantize
+        self.onnx = onnx
+        self.cache_size = cache_size
+
+        self._pipeline = None
+        self._load_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: Dict[str, Future] = {}
+        self._worker: Optional[threading.Thread] = None
+
+        self.headlines_scored = 0
+        self.batches = 0
+        self.inference_seconds = 0.0
+        self.cache_hits = 0
+
+    @classmethod
+    def get_instance(cls, **config) -> 'SentimentService':
+        """Shared service for the process; config only applies on first call"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(**config)
+            return cls._instance
+
+    def _load_pipeline(self):
+        with self._load_lock:
+            if self._pipeline is not None:
+                return self._pipeline
+
+            from transformers import pipeline
+            if self.num_threads:
+                import torch
+                torch.set_num_threads(self.num_threads)
+
+            if self.onnx:
+                try:
+                    from optimum.onnxruntime import ORTModelForSequenceClassification
+                    from transformers import AutoTokenizer
+                except ImportError as e:
+                    raise ImportError("onnx=True requires optimum[onnxruntime]") from e
+                model_id = self.model or 'distilbert-base-uncased-finetuned-sst-2-english'
+                ort_model = ORTModelForSequenceClassification.from_pretrained(model_id, export=True)
+                tokenizer = AutoTokenizer.from_pretrained(model_id)
+                self._pipeline = pipeline("sentiment-analysis", model=ort_model, tokenizer=tokenizer)
+            else:
+                kwargs = {'model': self.model} if self.model else {}
+                self._pipeline = pipeline("sentiment-analysis", device=-1, **kwargs)
+                if self.quantize:
+                    import torch
+                    self._pipeline.model = torch.quantization.quantize_dynamic(
+                        self._pipeline.model, {torch.nn.Linear}, dtype=torch.qint8
+                    )
+            return self._pipeline
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._score_batch(batch)
+
+    def _score_batch(self, batch: List[tuple]):
+        texts = [text for _, text in batch]
+        try:
+            analyzer = self._load_pipeline()
+            start = time.perf_counter()
+            with instrumentation.timer('sentiment_inference'):
+                outputs = analyzer(texts, batch_size=len(texts), truncation=True)
+            self.inference_seconds += time.perf_counter() - start
+            instrumentation.increment('sentiment_headlines', len(texts))
+            self.batches += 1
+            self.headlines_scored += len(texts)
+        except Exception as e:
+            with self._cache_lock:
+                for key, _ in batch:
+                    self._pending.pop(key).set_exception(e)
+            return
+
+        with self._cache_lock:
+            for (key, _), result in zip(batch, outputs):
+                score = result['score'] if result['label'] == 'POSITIVE' else -result['score']
+                self._cache[key] = score
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+                self._pending.pop(key).set_result(score)
+
+    def score(self, texts: List[str]) -> List[float]:
+        """
+        Signed sentiment scores (positive > 0, negative < 0) for each headline
+
+        Args:
+            texts (List[str]): Headlines to score
+
+        Returns:
+            List[float]: One score per headline, in input order
+        """
+        keys = [_text_key(t) for t in texts]
+        scores: Dict[str, Any] = {}
+        with self._cache_lock:
+            for key, text in zip(keys, texts):
+                if key in scores:
+                    continue
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    scores[key] = self._cache[key]
+                    self.cache_hits += 1
+                elif key in self._pending:
+                    scores[key] = self._pending[key]
+                else:
+                    future = Future()
+                    self._pending[key] = future
+                    scores[key] = future
+                    self._queue.put((key, text))
+
+        if any(isinstance(v, Future) for v in scores.values()):
+            self._ensure_worker()
+        return [
+            scores[key].result() if isinstance(scores[key], Future) else scores[key]
+            for key in keys
+        ]
+
+    def stats(self) -> Dict[str, float]:
+        """Scoring counters including throughput in headlines per second"""
+        return {
+            'headlines_scored': self.headlines_scored,
+            'batches': self.batches,
+            'cache_hits': self.cache_hits,
+            'cached_scores': len(self._cache),
+            'inference_seconds': self.inference_seconds,
+            'headlines_per_second': (
+                self.headlines_scored / self.inference_seconds if self.inference_seconds else 0.0
+            )
+        }
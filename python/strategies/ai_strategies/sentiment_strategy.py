@@ -1,42 +1,56 @@
+import numpy as np
 import pandas as pd
-from transformers import pipeline
 import yfinance as yf
 from newsapi import NewsApiClient
 from ..base_strategy import BaseStrategy
+from .news_cache import NewsCache, NewsRepository, FileNewsClient, _to_day
+from .sentiment_service import SentimentService
 
 class SentimentStrategy(BaseStrategy):
     def __init__(self, parameters: dict = None):
         default_params = {
-            'news_api_key': None,  # Required
+            'news_api_key': None,  # Required unless news_data_dir is set
             'sentiment_threshold': 0.6,
-            'lookback_days': 3
+            'lookback_days': 3,
+            'news_cache_path': ':memory:',  # SQLite file to persist fetched articles
+            'news_data_dir': None,  # Serve articles from JSON files (offline backtests)
+            'news_max_workers': 4,
+            'news_calls_per_second': 1.0,
+            'sentiment_service': {}  # SentimentService options, applied on first load
         }
-        super().__init__(parameters or default_params)
-        self.sentiment_analyzer = pipeline("sentiment-analysis")
-        self.news_api = NewsApiClient(api_key=self.parameters['news_api_key'])
+        super().__init__({**default_params, **(parameters or {})})
+        self.sentiment_analyzer = SentimentService.get_instance(
+            **self.parameters.get('sentiment_service', {})
+        )
+        if self.parameters.get('news_data_dir'):
+            client = FileNewsClient(self.parameters['news_data_dir'])
+        else:
+            client = NewsApiClient(api_key=self.parameters['news_api_key'])
+        self.news_api = NewsRepository(
+            client,
+            cache=NewsCache(self.parameters.get('news_cache_path', ':memory:')),
+            max_workers=self.parameters.get('news_max_workers', 4),
+            calls_per_second=self.parameters.get('news_calls_per_second', 1.0)
+        )
     
     def _get_news_sentiment(self, symbol: str, date: pd.Timestamp) -> float:
         """Calculate average sentiment score from news articles"""
         try:
-            # Get news articles
-            articles = self.news_api.get_everything(
-                q=symbol,
-                from_param=date - pd.Timedelta(days=self.parameters['lookback_days']),
-                to=date,
-                language='en',
-                sort_by='relevancy'
+            # Get news articles (served from the local cache after the first fetch)
+            articles = self.news_api.get_articles(
+                symbol,
+                date - pd.Timedelta(days=self.parameters['lookback_days']),
+                date
             )
             
-            if not articles['articles']:
+            if not articles:
                 return 0
             
-            # Analyze sentiment
-            sentiments = []
-            for article in articles['articles'][:5]:  # Analyze top 5 articles
-                title = article['title']
-                result = self.sentiment_analyzer(title)[0]
-                sentiment_score = result['score'] if result['label'] == 'POSITIVE' else -result['score']
-                sentiments.append(sentiment_score)
+            # Analyze sentiment of the 5 most recent articles
+            titles = [article['title'] for article in articles[:5] if article.get('title')]
+            if not titles:
+                return 0
+            sentiments = self.sentiment_analyzer.score(titles)
             
             return sum(sentiments) / len(sentiments)
         
@@ -44,23 +58,52 @@ class SentimentStrategy(BaseStrategy):
             print(f"Error getting news sentiment: {e}")
             return 0
     
+    def _used_titles(self, articles: list, dates: pd.Index) -> list:
+        """
+        Union over dates of the titles _get_news_sentiment scores: the 5 most
+        recent articles of each lookback window, given the window's articles
+        newest first as returned by the news cache
+        """
+        if not articles:
+            return []
+        published = np.array([_to_day(a['publishedAt']).value for a in articles])
+        lookback = pd.Timedelta(days=self.parameters['lookback_days'])
+        titles = {}
+        for date in dates:
+            first = np.searchsorted(-published, -_to_day(date).value, side='left')
+            oldest = _to_day(date - lookback).value
+            for i in range(first, min(first + 5, len(articles))):
+                if published[i] >= oldest and articles[i].get('title'):
+                    titles[articles[i]['title']] = None
+        return list(titles)
+    
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """Generate trading signals based on news sentiment"""
-        df = data.copy()
-        df['signal'] = 0
+        signal = np.zeros(len(data), dtype=np.int64)
         
         # Get symbol from data
-        symbol = df.get('symbol', 'UNKNOWN')
+        symbol = self.parameters.get('symbol') or data.attrs.get('symbol')
+        if symbol is None:
+            symbol = data['symbol'].iloc[0] if 'symbol' in data.columns and len(data) else 'UNKNOWN'
+        
+        # Fetch the whole backtest window once instead of once per day
+        if len(data):
+            articles = self.news_api.get_articles(
+                symbol,
+                data.index.min() - pd.Timedelta(days=self.parameters['lookback_days']),
+                data.index.max()
+            )
+            # Score the headlines the daily lookups will use in batched passes up front
+            self.sentiment_analyzer.score(self._used_titles(articles, data.index))
         
         # Calculate sentiment for each day
-        for i in range(len(df)):
-            date = df.index[i]
+        for i, date in enumerate(data.index):
             sentiment = self._get_news_sentiment(symbol, date)
             
             # Generate signals based on sentiment
             if sentiment > self.parameters['sentiment_threshold']:
-                df.iloc[i, df.columns.get_loc('signal')] = 1
+                signal[i] = 1
             elif sentiment < -self.parameters['sentiment_threshold']:
-                df.iloc[i, df.columns.get_loc('signal')] = -1
+                signal[i] = -1
         
-        return df
+        return self._signal_frame(data, signal)
@@ -1,10 +1,16 @@
 from abc import ABC, abstractmethod
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import numpy as np
+from ..features.feature_store import FeatureStore, compute_feature
+from .incremental import SignalState, WindowedSignalState
+from ..utils.compact import to_compact
 
 class BaseStrategy(ABC):
-    def __init__(self, parameters: Dict[str, Any] = None):
+    def __init__(self, parameters: Dict[str, Any] = None,
+                 feature_store: Optional[FeatureStore] = None):
         self.parameters = parameters or {}
+        self.feature_store = feature_store
         
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -22,3 +28,34 @@ class BaseStrategy(ABC):
     def set_parameters(self, parameters: Dict[str, Any]):
         """Update strategy parameters"""
         self.parameters.update(parameters)
+    
+    def signal_state(self) -> SignalState:
+        """
+        Incremental state for live signals. The default re-evaluates
+        generate_signals on a window of the last parameters['live_window'] (500)
+        bars; strategies with cheap recursive updates override this.
+        """
+        return WindowedSignalState(self, self.parameters.get('live_window', 500))
+    
+    def _feature(self, data: pd.DataFrame, name: str, **params) -> pd.Series:
+        """
+        Derived feature aligned to data, served from the feature store when one is
+        configured and the symbol is known (parameters['symbol'] or data.attrs['symbol'])
+        """
+        symbol = self.parameters.get('symbol') or data.attrs.get('symbol')
+        if self.feature_store is None or symbol is None:
+            return compute_feature(name, data, **params)
+        return self.feature_store.get(symbol, name, data, **params)
+    
+    def _signal_frame(self, data: pd.DataFrame, signal: np.ndarray, compact: bool = False,
+                      **columns) -> pd.DataFrame:
+        """
+        generate_signals output: the input columns (only a float32 'close' in compact
+        mode), then columns and 'signal'. The input columns are referenced, not copied,
+        so read-only views such as the ensemble's can be passed in directly.
+        """
+        base = to_compact(data, ['close']) if compact else data
+        df = pd.DataFrame({**{c: base[c] for c in base.columns}, **columns, 'signal': signal},
+                          index=data.index, copy=False)
+        df.attrs.update(data.attrs)
+        return df
@@ -0,0 +1,103 @@
+import pandas as pd
+import numpy as np
+from typing import Dict
+from .base_strategy import BaseStrategy
+
+
+def read_only_view(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Frame sharing data's column arrays with writes disabled, so constituents
+    can read one copy of the market data but cannot modify it for each other
+    """
+    columns = {}
+    for name, series in data.items():
+        values = series.to_numpy().view()
+        values.flags.writeable = False
+        columns[name] = values
+    view = pd.DataFrame(columns, index=data.index, copy=False)
+    view.attrs.update(data.attrs)
+    return view
+
+
+class EnsembleStrategy(BaseStrategy):
+    def __init__(self, strategies: Dict[str, BaseStrategy], parameters: dict = None):
+        """
+        Combine the signals of several strategies evaluated on one shared data view
+
+        Args:
+            strategies (Dict[str, BaseStrategy]): Constituent strategies by name
+            parameters (dict):
+                method: 'majority', 'weighted', 'unanimous' or 'gated'
+                weights: Name -> weight for 'weighted', equal weights if omitted
+                threshold: Minimum |weighted score| (in [0, 1]) to emit a signal
+                primary: Strategy whose signals are gated by all others ('gated')
+                gate_mode: 'agree' (gates must give the same signal) or
+                    'not_oppose' (gates must not give the opposite signal)
+        """
+        default_params = {
+            'method': 'majority',
+            'weights': None,
+            'threshold': 0.5,
+            'primary': None,
+            'gate_mode': 'agree'
+        }
+        super().__init__({**default_params, **(parameters or {})})
+        if not strategies:
+            raise ValueError("EnsembleStrategy needs at least one strategy")
+        self.strategies = strategies
+
+    def constituent_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Signals of every constituent (one int8 column per name) from a single read-only view"""
+        view = read_only_view(data)
+        return pd.DataFrame({
+            name: strategy.generate_signals(view)['signal'].to_numpy(dtype=np.int8)
+            for name, strategy in self.strategies.items()
+        }, index=data.index)
+
+    def combine(self, signals: pd.DataFrame) -> np.ndarray:
+        """Combine constituent signal columns into one int8 signal array"""
+        votes = signals.to_numpy(dtype=np.int8)
+        method = self.parameters.get('method', 'majority')
+        combined = np.zeros(len(signals), dtype=np.int8)
+
+        if method == 'majority':
+            half = votes.shape[1] / 2
+            combined[(votes == 1).sum(axis=1) > half] = 1
+            combined[(votes == -1).sum(axis=1) > half] = -1
+        elif method == 'weighted':
+            weights = self.parameters.get('weights') or {}
+            w = np.array([weights.get(name, 1.0) for name in signals.columns], dtype=np.float64)
+            score = votes @ w / np.abs(w).sum()
+            threshold = self.parameters.get('threshold', 0.5)
+            combined[score >= threshold] = 1
+            combined[score <= -threshold] = -1
+        elif method == 'unanimous':
+            combined[(votes == 1).all(axis=1)] = 1
+            combined[(votes == -1).all(axis=1)] = -1
+        elif method == 'gated':
+            primary = self.parameters.get('primary') or signals.columns[0]
+            base = signals[primary].to_numpy(dtype=np.int8)
+            gates = signals.drop(columns=[primary]).to_numpy(dtype=np.int8)
+            if self.parameters.get('gate_mode', 'agree') == 'agree':
+                allowed = (gates == base[:, None]).all(axis=1)
+            else:
+                allowed = (gates != -base[:, None]).all(axis=1)
+            combined = np.where(allowed, base, 0).astype(np.int8)
+        else:
+            raise ValueError(f"Unknown ensemble method: {method}")
+
+        return combined
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate combined trading signals
+
+        Returns:
+            pd.DataFrame: 'close', one 'signal_<name>' column per constituent and the combined 'signal'
+        """
+        signals = self.constituent_signals(data)
+        df = pd.DataFrame({'close': data['close']}, index=data.index)
+        for name in signals.columns:
+            df[f'signal_{name}'] = signals[name]
+        df['signal'] = self.combine(signals)
+        return df
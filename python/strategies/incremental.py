@@ -0,0 +1,77 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+
+class SignalState(ABC):
+    """Live strategy state that turns one new bar into the current signal"""
+
+    @abstractmethod
+    def update(self, bar: Dict[str, Any]) -> int:
+        """
+        Consume the next bar
+
+        Args:
+            bar (Dict[str, Any]): 'date', 'open', 'high', 'low', 'close', 'volume'
+
+        Returns:
+            int: Signal after this bar (1 buy, -1 sell, 0 hold)
+        """
+        pass
+
+
+class WindowedSignalState(SignalState):
+    def __init__(self, strategy, window: int = 500):
+        """
+        Generic state for any BaseStrategy: re-runs generate_signals on a bounded
+        window of recent bars, so each bar costs O(window) regardless of history
+
+        Args:
+            strategy (BaseStrategy): Strategy instance
+            window (int): Bars kept for signal generation
+        """
+        self.strategy = strategy
+        self.bars = deque(maxlen=window)
+
+    def update(self, bar: Dict[str, Any]) -> int:
+        self.bars.append(bar)
+        df = pd.DataFrame(list(self.bars)).set_index('date')
+        signal = self.strategy.generate_signals(df)['signal'].iloc[-1]
+        return int(signal)
+
+
+class RollingMean:
+    """
+    Amortized O(1) simple moving average over the last `window` values. The
+    running sum is recomputed exactly every `window` updates so rounding cannot
+    accumulate, and a window of identical values returns that value as pandas
+    does; otherwise it can differ from pandas rolling(window).mean() in the last
+    bits, so consumers compare means with a tolerance
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.repeats = 0  # Trailing run of identical values
+        self.since_resum = 0
+
+    def update(self, value: float) -> Optional[float]:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.repeats = self.repeats + 1 if self.values and value == self.values[-1] else 1
+        self.values.append(value)
+        self.since_resum += 1
+        if self.since_resum >= self.window:
+            self.total = math.fsum(self.values)
+            self.since_resum = 0
+        else:
+            self.total += value
+        if len(self.values) < self.window:
+            return None
+        if self.repeats >= self.window:
+            return value
+        return self.total / self.window
@@ -1,14 +1,40 @@
 import pandas as pd
 import numpy as np
 from .base_strategy import BaseStrategy
+from .incremental import SignalState, RollingMean
+
+# Relative gap under which the two averages count as equal (no signal). A running sum and a
+# pandas rolling mean of the same window can differ in the last bits when they are equal.
+TIE_RTOL = 1e-9
+
+
+def crossover_signal(short, long):
+    """1 where short > long, -1 where short < long, 0 at (near) ties and NaN; scalars or arrays"""
+    tie = np.isclose(short, long, rtol=TIE_RTOL, atol=0.0)
+    return np.where(tie, 0, np.where(short > long, 1, np.where(short < long, -1, 0)))
+
+
+class MovingAverageState(SignalState):
+    def __init__(self, short_window: int, long_window: int):
+        """O(1) per bar crossover state matching generate_signals"""
+        self.short = RollingMean(short_window)
+        self.long = RollingMean(long_window)
+    
+    def update(self, bar) -> int:
+        close = float(bar['close'])
+        short, long = self.short.update(close), self.long.update(close)
+        if short is None or long is None:
+            return 0
+        return int(crossover_signal(short, long))
 
 class MovingAverageCrossoverStrategy(BaseStrategy):
-    def __init__(self, parameters: dict = None):
+    def __init__(self, parameters: dict = None, feature_store=None):
         default_params = {
             'short_window': 20,
-            'long_window': 50
+            'long_window': 50,
+            'compact': False  # float32 prices/SMAs, int8 signals, 'close' column only
         }
-        super().__init__(parameters or default_params)
+        super().__init__({**default_params, **(parameters or {})}, feature_store)
     
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -20,19 +46,22 @@ class MovingAverageCrossoverStrategy(BaseStrategy):
         Returns:
             pd.DataFrame: DataFrame with signals
         """
-        df = data.copy()
+        compact = self.parameters.get('compact', False)
+        float_dtype = np.float32 if compact else np.float64
         
-        # Calculate moving averages
-        df['SMA_short'] = df['close'].rolling(
-            window=self.parameters['short_window']
-        ).mean()
-        df['SMA_long'] = df['close'].rolling(
-            window=self.parameters['long_window']
-        ).mean()
+        # Calculate moving averages (from the source prices so stored features stay float64)
+        short = self._feature(
+            data, 'sma', window=self.parameters['short_window']
+        ).to_numpy(dtype=float_dtype)
+        long = self._feature(
+            data, 'sma', window=self.parameters['long_window']
+        ).to_numpy(dtype=float_dtype)
         
-        # Generate signals
-        df['signal'] = 0
-        df.loc[df['SMA_short'] > df['SMA_long'], 'signal'] = 1
-        df.loc[df['SMA_short'] < df['SMA_long'], 'signal'] = -1
+        # Generate signals into a separate array; the input frame is never copied
+        signal = crossover_signal(short, long).astype(np.int8 if compact else np.int64)
         
-        return df
+        return self._signal_frame(data, signal, compact, SMA_short=short, SMA_long=long)
+    
+    def signal_state(self) -> MovingAverageState:
+        """Incremental crossover state for live signals"""
+        return MovingAverageState(self.parameters['short_window'], self.parameters['long_window'])
@@ -0,0 +1,12 @@
+"""
+Shared utilities for strategies, screeners and the backtester
+
+- compact: float32/int8 compact frames and per-stage memory reporting
+- instrumentation: stage timers, counters, Prometheus rendering and a sampling profiler
+"""
+
+from .compact import (to_compact, compact_deviations, MemoryTracker, COMPACT_RTOL,
+                      COMPACT_TOLERANCES)
+
+__all__ = ['to_compact', 'compact_deviations', 'MemoryTracker', 'COMPACT_RTOL',
+           'COMPACT_TOLERANCES']
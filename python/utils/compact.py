@@ -0,0 +1,145 @@
+import sys
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Relative rounding of prices and volumes stored as float32 (~6e-8 measured)
+COMPACT_RTOL = 1e-6
+
+# Maximum |compact - float64| of screener indicators, as (tolerance, scale).
+# Compact mode computes indicators in float64 from the float32-rounded inputs,
+# so differences come from that input rounding. Scale None means the tolerance
+# is absolute in the indicator's own units; 'price' and 'volume' mean it is in
+# units of the frame's largest close or volume, 'total_volume' in units of the
+# frame's summed volume (cumulative indicators). Measured on synthetic daily,
+# 5-minute and 1-minute bars with margin. MFI and ADX compare consecutive bars,
+# so on 1-minute bars a tie created by rounding can move them by several points.
+COMPACT_TOLERANCES: Dict[str, Tuple[float, Optional[str]]] = {
+    **{c: (1e-6, 'price') for c in (
+        'open', 'high', 'low', 'close', 'prev_close', 'macd', 'macd_signal', 'macd_diff',
+        'bb_high', 'bb_low', 'bb_mid', 'atr',
+        'sma_5', 'sma_10', 'sma_20', 'sma_50', 'sma_200',
+        'ema_5', 'ema_10', 'ema_20', 'ema_50', 'ema_200')},
+    'volume': (1e-6, 'volume'),
+    'volume_sma_20': (1e-6, 'volume'),
+    'obv': (1e-3, 'total_volume'),
+    'adl': (1e-5, 'total_volume'),
+    'rsi': (0.01, None),
+    'stoch_k': (0.05, None),
+    'stoch_d': (0.05, None),
+    'cci': (0.1, None),
+    'adx': (5.0, None),
+    'mfi': (10.0, None),
+    'cmf': (1e-3, None),
+    'bb_width': (1e-6, None),
+    'price_change': (1e-4, None),
+    'volume_ratio': (1e-5, None)
+}
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def to_compact(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Compact copy of a frame: selected columns only, floats and volume as float32
+
+    Args:
+        df (pd.DataFrame): Price or indicator frame
+        columns: Columns to keep, all columns if omitted (missing ones are skipped)
+
+    Returns:
+        pd.DataFrame: Frame with float32 numeric columns and int8 'signal'
+    """
+    if columns is not None:
+        df = df[[c for c in columns if c in df.columns]]
+    converted = {}
+    for name, series in df.items():
+        if name == 'signal':
+            converted[name] = series.astype(np.int8)
+        elif pd.api.types.is_float_dtype(series) or (
+                name == 'volume' and pd.api.types.is_integer_dtype(series)):
+            converted[name] = series.astype(np.float32)
+        else:
+            converted[name] = series
+    out = pd.DataFrame(converted, index=df.index)
+    out.attrs.update(df.attrs)
+    return out
+
+
+def compact_deviations(reference: pd.DataFrame, compact: pd.DataFrame) -> Dict[str, float]:
+    """
+    Largest difference of each COMPACT_TOLERANCES column of a compact frame from
+    its float64 reference, as a fraction of the column's tolerance (> 1 is out
+    of tolerance). Values missing in only one of the frames count as infinite.
+
+    Args:
+        reference (pd.DataFrame): Indicators computed without compact mode
+        compact (pd.DataFrame): The same indicators computed in compact mode
+    """
+    scales = {
+        None: 1.0,
+        'price': float(reference['close'].abs().max()),
+        'volume': float(reference['volume'].abs().max()),
+        'total_volume': float(reference['volume'].abs().sum())
+    }
+    deviations = {}
+    for column, (tolerance, scale) in COMPACT_TOLERANCES.items():
+        if column not in reference.columns or column not in compact.columns:
+            continue
+        expected = reference[column].to_numpy(dtype=np.float64)
+        actual = compact[column].to_numpy(dtype=np.float64)
+        if (np.isnan(expected) != np.isnan(actual)).any():
+            deviations[column] = float('inf')
+            continue
+        diff = np.abs(expected - actual)
+        worst = float(np.nanmax(diff)) if np.isfinite(diff).any() else 0.0
+        deviations[column] = worst / (tolerance * (scales[scale] or 1.0))
+    return deviations
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Memory held by a frame including its index"""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return int(peak if sys.platform == 'darwin' else peak * 1024)
+
+
+class MemoryTracker:
+    def __init__(self):
+        """Per-stage frame memory statistics (frames seen, total and peak bytes)"""
+        self.stages: Dict[str, Dict[str, int]] = {}
+
+    def record(self, stage: str, df: pd.DataFrame):
+        stats = self.stages.setdefault(stage, {'frames': 0, 'total_bytes': 0, 'peak_bytes': 0})
+        nbytes = frame_nbytes(df)
+        stats['frames'] += 1
+        stats['total_bytes'] += nbytes
+        stats['peak_bytes'] = max(stats['peak_bytes'], nbytes)
+
+    def report(self) -> Dict[str, Dict[str, int]]:
+        """Stage statistics plus the process peak resident set size"""
+        report = {stage: dict(stats) for stage, stats in self.stages.items()}
+        report['process'] = {'peak_rss_bytes': _peak_rss_bytes()}
+        return report
+
+    def summary(self) -> str:
+        lines = []
+        for stage, stats in self.stages.items():
+            lines.append(
+                f"{stage}: {stats['frames']} frames, "
+                f"total {stats['total_bytes'] / 2**20:.1f} MiB, "
+                f"peak {stats['peak_bytes'] / 2**20:.2f} MiB"
+            )
+        rss = _peak_rss_bytes()
+        if rss is not None:
+            lines.append(f"process peak RSS: {rss / 2**20:.1f} MiB")
+        return "\n".join(lines)
@@ -0,0 +1,206 @@
+import contextvars
+import functools
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+# Histogram buckets for stage durations, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, float('inf'))
+
+_enabled = os.environ.get('METRICS_ENABLED', '0').lower() in ('1', 'true', 'yes')
+_lock = threading.Lock()
+_counters: Dict[Tuple[str, tuple], float] = defaultdict(float)
+_histograms: Dict[tuple, list] = {}
+_request_timings: contextvars.ContextVar = contextvars.ContextVar('request_timings', default=None)
+
+
+def enable(flag: bool = True):
+    """Turn instrumentation on or off for the process (off unless METRICS_ENABLED=1)"""
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Clear all recorded metrics"""
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+class _Timer:
+    __slots__ = ('stage', 'labels', 'start')
+
+    def __init__(self, stage: str, labels: tuple):
+        self.stage = stage
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start, self.labels)
+        return False
+
+
+def timer(stage: str, **labels):
+    """
+    Context manager timing a stage into the twh_stage_seconds histogram and the
+    current request's breakdown; a shared no-op when instrumentation is disabled
+    """
+    if not _enabled:
+        return _NOOP
+    return _Timer(stage, tuple(sorted(labels.items())))
+
+
+def timed(stage: str, **labels):
+    """Decorator form of timer()"""
+    label_items = tuple(sorted(labels.items()))
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(stage, label_items):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe(stage: str, seconds: float, labels: tuple = ()):
+    key = (stage,) + labels
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [[0] * len(BUCKETS), 0, 0.0]
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist[0][i] += 1
+        hist[1] += 1
+        hist[2] += seconds
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def increment(name: str, value: float = 1, **labels):
+    """Add to the twh_<name>_total counter"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[(name, tuple(sorted(labels.items())))] += value
+
+
+@contextmanager
+def request_timings():
+    """Collect per-stage seconds for everything timed inside the block (yields the dict)"""
+    timings: Dict[str, float] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def current_timings() -> Optional[Dict[str, float]]:
+    """Per-stage breakdown of the enclosing request_timings() block, if any"""
+    timings = _request_timings.get()
+    return dict(timings) if timings is not None else None
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ''
+    escaped = ','.join(
+        '{}="{}"'.format(k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in labels
+    )
+    return '{' + escaped + '}'
+
+
+def render_prometheus() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(v[0]), v[1], v[2]) for k, v in _histograms.items()}
+
+    for name in sorted({name for name, _ in counters}):
+        lines.append(f"# TYPE twh_{name}_total counter")
+        for (n, labels), value in sorted(counters.items()):
+            if n == name:
+                lines.append(f"twh_{name}_total{_format_labels(labels)} {value}")
+
+    if histograms:
+        lines.append("# TYPE twh_stage_seconds histogram")
+    for key, (buckets, count, total) in sorted(histograms.items()):
+        labels = (('stage', key[0]),) + key[1:]
+        for bound, bucket_count in zip(BUCKETS, buckets):
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f"twh_stage_seconds_bucket{_format_labels(labels + (('le', le),))} {bucket_count}")
+        lines.append(f"twh_stage_seconds_count{_format_labels(labels)} {count}")
+        lines.append(f"twh_stage_seconds_sum{_format_labels(labels)} {total}")
+
+    return '\n'.join(lines) + '\n'
+
+
+class SamplingProfiler:
+    def __init__(self, path: str, interval: float = 0.005, thread_id: Optional[int] = None):
+        """
+        Opt-in sampling profiler writing folded stacks ("a;b;c count" lines),
+        the input format of flamegraph.pl, speedscope and inferno
+
+        Args:
+            path (str): Output file
+            interval (float): Seconds between samples
+            thread_id (int): Thread to sample, the calling thread if omitted
+        """
+        self.path = path
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples: Dict[str, int] = defaultdict(int)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        with open(self.path, 'w') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+        return False